@@ -3,7 +3,7 @@ Database module for the price scraper.
 Handles both SQLite and CSV backends with automatic migration.
 """
 
-from .manager import DatabaseManager
+from .manager import DatabaseManager, parse_history_timestamps
 from .models import Product, PriceHistory, URLEntry, CacheEntry
 from .config import DatabaseConfig
 
@@ -14,4 +14,5 @@ __all__ = [
     "URLEntry",
     "CacheEntry",
     "DatabaseConfig",
+    "parse_history_timestamps",
 ]
@@ -7,14 +7,144 @@ import sqlite3
 import pandas as pd
 import csv
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterator, Union
 from contextlib import contextmanager
 
 from .config import DatabaseConfig
 from .models import Product, PriceHistory, URLEntry, CacheEntry, CREATE_TABLES_SQL
 
+# Number of buffered product issues that triggers a flush to the database
+ISSUE_FLUSH_THRESHOLD = 200
+
+# Per-connection tuning: cheaper commits under WAL, 64 MiB page cache,
+# 256 MiB memory-mapped reads and a 30 s wait instead of SQLITE_BUSY errors
+SQLITE_CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout=30000;
+"""
+
+# Hot-path statements, kept as constants so every call sends identical SQL text
+_SQL_GET_PRODUCTS = (
+    "SELECT id, name, category, created_at, updated_at FROM products ORDER BY name"
+)
+
+_SQL_GET_PRODUCT_URLS = """
+    SELECT u.id, u.product_id, u.url, u.site_name, u.active, u.created_at
+    FROM urls u
+    JOIN products p ON u.product_id = p.id
+    WHERE p.name = ? AND u.active = 1
+    ORDER BY u.site_name
+"""
+
+_SQL_GET_PRODUCTS_WITH_URLS = """
+    SELECT p.id, p.name, p.category, p.created_at, p.updated_at,
+           u.id, u.product_id, u.url, u.site_name, u.active, u.created_at
+    FROM products p
+    LEFT JOIN urls u ON u.product_id = p.id AND u.active = 1
+    ORDER BY p.name, u.site_name
+"""
+
+_SQL_GET_PRODUCT_BY_URL = """
+    SELECT p.id, p.name, p.category, p.created_at, p.updated_at
+    FROM products p
+    JOIN urls u ON p.id = u.product_id
+    WHERE u.url = ?
+"""
+
+_SQL_INSERT_PRICE = """
+    INSERT INTO price_history
+    (product_id, url, price, scraped_at, site_name, vendor_name, vendor_url, is_marketplace, is_prime_eligible)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_GET_PRICE_HISTORY = """
+    SELECT
+        DATE(ph.scraped_at) as Date,
+        p.name as Product_Name,
+        ph.url as URL,
+        ph.price as Price,
+        ph.scraped_at as Timestamp_ISO
+    FROM price_history ph
+    JOIN products p ON ph.product_id = p.id
+    {where}
+    ORDER BY ph.scraped_at
+"""
+
+_SQL_GET_CACHE_ENTRY = """
+    SELECT last_scraped, cache_duration_hours, status, next_retry
+    FROM cache WHERE url = ?
+"""
+
+# One round-trip per cache update. attempts counts consecutive failures: a
+# success resets it, a failure bumps it in place. For failures without an
+# explicit retry time, the exponential backoff (1h, 2h, 4h, 8h, 16h, then 24h
+# max) is derived from the old count.
+_SQL_UPSERT_CACHE = """
+    INSERT INTO cache
+    (url, last_scraped, cache_duration_hours, status, attempts, next_retry)
+    VALUES (:url, :now, :duration, :status, :status = 'failed', :next_retry)
+    ON CONFLICT(url) DO UPDATE SET
+        last_scraped = excluded.last_scraped,
+        cache_duration_hours = excluded.cache_duration_hours,
+        status = excluded.status,
+        attempts = CASE WHEN excluded.status = 'success' THEN 0
+                        ELSE cache.attempts + 1 END,
+        next_retry = CASE
+            WHEN :backoff THEN datetime(
+                :now,
+                '+' || (CASE WHEN cache.attempts >= 5 THEN 24
+                             ELSE 1 << cache.attempts END) || ' hours'
+            )
+            ELSE excluded.next_retry
+        END
+"""
+
+_SQL_INSERT_ISSUE = """
+    INSERT INTO product_issues
+    (product_id, url, issue_type, expected_name, actual_name, error_message, http_status_code, detected_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# UTC offset at the end of an ISO timestamp ("Z", "+02:00", "+0200")
+_TIMESTAMP_OFFSET_PATTERN = (
+    r"\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(Z|[+-]\d{2}(?::?\d{2})?)$"
+)
+
+
+def parse_history_timestamps(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert Timestamp_ISO to datetime64, or leave it as text.
+
+    The column stays text when any value does not parse, or when values mix
+    naive and offset-carrying timestamps or carry different offsets. pandas
+    versions disagree on such columns (pandas 2 silently converts them to
+    UTC, pandas 3 raises), so this keeps the result the same on both.
+    """
+    if "Timestamp_ISO" not in df.columns:
+        return df
+    values = df["Timestamp_ISO"].dropna()
+    if values.empty or pd.api.types.is_datetime64_any_dtype(values):
+        return df
+    offsets = (
+        values.astype(str)
+        .str.extract(_TIMESTAMP_OFFSET_PATTERN, expand=False)
+        .str.replace("Z", "+00:00", regex=False)
+    )
+    if offsets.notna().any() and (offsets.isna().any() or offsets.nunique() > 1):
+        return df
+    try:
+        df["Timestamp_ISO"] = pd.to_datetime(df["Timestamp_ISO"], format="ISO8601")
+    except (ValueError, TypeError):
+        pass
+    return df
+
 
 class DatabaseManager:
     """Unified database manager supporting both SQLite and CSV backends."""
@@ -22,6 +152,12 @@ class DatabaseManager:
     def __init__(self, config: Optional[DatabaseConfig] = None):
         self.config = config or DatabaseConfig()
         self.logger = logging.getLogger(__name__)
+        self._ingest_conn: Optional[sqlite3.Connection] = None
+        self._issue_buffer: deque = deque()
+        # Read-only connections, one per thread, reused across read methods
+        self._reader_local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
 
         if self.config.database_type == "sqlite":
             self._init_sqlite()
@@ -31,6 +167,9 @@ class DatabaseManager:
     def _init_sqlite(self):
         """Initialize SQLite database and create tables."""
         with self._get_connection() as conn:
+            # WAL is persistent and needs a file-backed database
+            if not self._is_in_memory():
+                conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript(CREATE_TABLES_SQL)
             conn.commit()
         self.logger.info(f"SQLite database initialized at {self.config.sqlite_path}")
@@ -43,13 +182,88 @@ class DatabaseManager:
                 "SQLite connection requested but database_type is not 'sqlite'"
             )
 
+        # Reuse the bulk-ingest connection so its relaxed PRAGMAs apply
+        if self._ingest_conn is not None:
+            yield self._ingest_conn
+            return
+
         conn = sqlite3.connect(self.config.sqlite_path)
         conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn.executescript(SQLITE_CONNECTION_PRAGMAS)
         try:
             yield conn
         finally:
             conn.close()
 
+    @contextmanager
+    def _reader(self):
+        """Get this thread's cached read-only SQLite connection.
+
+        Under WAL, readers never block the writer connection, so read methods
+        can run alongside writes from other threads. Reads inside
+        fast_ingest go through the ingest connection to see its pending rows.
+        """
+        if self.config.database_type != "sqlite":
+            raise ValueError(
+                "SQLite connection requested but database_type is not 'sqlite'"
+            )
+
+        # In-memory databases are private to their connection
+        if self._ingest_conn is not None or self._is_in_memory():
+            with self._get_connection() as conn:
+                yield conn
+            return
+
+        conn = getattr(self._reader_local, "conn", None)
+        if conn is None:
+            conn = self._open_reader_connection()
+            self._reader_local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        yield conn
+
+    def _open_reader_connection(self) -> sqlite3.Connection:
+        """Open a new read-only connection to the SQLite file."""
+        uri = Path(self.config.sqlite_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(SQLITE_CONNECTION_PRAGMAS)
+        return conn
+
+    def _is_in_memory(self) -> bool:
+        """Whether the configured SQLite database lives in memory."""
+        path = self.config.sqlite_path
+        return path == ":memory:" or "mode=memory" in path or "::memory:" in path
+
+    @contextmanager
+    def fast_ingest(self):
+        """Trade durability for throughput during a bulk scrape ingest.
+
+        Every manager call inside the block shares one connection running with
+        ``synchronous=OFF``, so commits no longer wait on fsync.
+        On exit ``synchronous`` is restored to ``NORMAL`` and the WAL is
+        checkpointed. A crash mid-ingest may lose the last batch of prices,
+        which is acceptable since the scraper re-fetches them on its next run.
+        """
+        if self.config.database_type != "sqlite" or self._ingest_conn is not None:
+            yield
+            return
+
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA wal_autocheckpoint=10000")
+            self._ingest_conn = conn
+            try:
+                yield
+                conn.commit()
+            finally:
+                self._ingest_conn = None
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA wal_autocheckpoint=1000")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def _migrate_from_csv_if_needed(self):
         """Migrate data from CSV files to SQLite if database is empty."""
         with self._get_connection() as conn:
@@ -210,6 +424,34 @@ class DatabaseManager:
 
         return "Unknown"
 
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse a stored timestamp column, keeping NULL as None."""
+        return datetime.fromisoformat(value) if value else None
+
+    @classmethod
+    def _row_to_product(cls, row: sqlite3.Row) -> Product:
+        """Build a Product from an (id, name, category, created_at, updated_at) row."""
+        return Product(
+            id=row[0],
+            name=row[1],
+            category=row[2],
+            created_at=cls._parse_timestamp(row[3]),
+            updated_at=cls._parse_timestamp(row[4]),
+        )
+
+    @classmethod
+    def _row_to_url_entry(cls, row: sqlite3.Row) -> URLEntry:
+        """Build a URLEntry from an (id, product_id, url, site_name, active, created_at) row."""
+        return URLEntry(
+            id=row[0],
+            product_id=row[1],
+            url=row[2],
+            site_name=row[3],
+            active=bool(row[4]),
+            created_at=cls._parse_timestamp(row[5]),
+        )
+
     # Product management methods
     def get_products(self) -> List[Product]:
         """Get all products."""
@@ -238,32 +480,10 @@ class DatabaseManager:
 
     def _get_products_sqlite(self) -> List[Product]:
         """Get products from SQLite."""
-        products = []
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT id, name, category, created_at, updated_at FROM products ORDER BY name"
-            ).fetchall()
-
-            for row in rows:
-                products.append(
-                    Product(
-                        id=row["id"],
-                        name=row["name"],
-                        category=row["category"],
-                        created_at=(
-                            datetime.fromisoformat(row["created_at"])
-                            if row["created_at"]
-                            else None
-                        ),
-                        updated_at=(
-                            datetime.fromisoformat(row["updated_at"])
-                            if row["updated_at"]
-                            else None
-                        ),
-                    )
-                )
+        with self._reader() as conn:
+            rows = conn.execute(_SQL_GET_PRODUCTS).fetchall()
 
-        return products
+        return [self._row_to_product(row) for row in rows]
 
     def get_product_urls(self, product_name: str) -> List[URLEntry]:
         """Get URLs for a specific product."""
@@ -294,34 +514,57 @@ class DatabaseManager:
 
     def _get_product_urls_sqlite(self, product_name: str) -> List[URLEntry]:
         """Get product URLs from SQLite."""
-        urls = []
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                """SELECT u.id, u.product_id, u.url, u.site_name, u.active, u.created_at
-                   FROM urls u
-                   JOIN products p ON u.product_id = p.id
-                   WHERE p.name = ? AND u.active = 1
-                   ORDER BY u.site_name""",
-                (product_name,),
-            ).fetchall()
-
-            for row in rows:
-                urls.append(
-                    URLEntry(
-                        id=row["id"],
-                        product_id=row["product_id"],
-                        url=row["url"],
-                        site_name=row["site_name"],
-                        active=bool(row["active"]),
-                        created_at=(
-                            datetime.fromisoformat(row["created_at"])
-                            if row["created_at"]
-                            else None
-                        ),
-                    )
-                )
+        with self._reader() as conn:
+            rows = conn.execute(_SQL_GET_PRODUCT_URLS, (product_name,)).fetchall()
 
-        return urls
+        return [self._row_to_url_entry(row) for row in rows]
+
+    def get_products_with_urls(self) -> List[Tuple[Product, List[URLEntry]]]:
+        """Get all products with their active URLs in one read.
+
+        Same result as get_products() followed by get_product_urls() for each
+        product, without the per-product queries.
+        """
+        if self.config.database_type == "csv":
+            return self._get_products_with_urls_csv()
+        else:
+            return self._get_products_with_urls_sqlite()
+
+    def _get_products_with_urls_csv(self) -> List[Tuple[Product, List[URLEntry]]]:
+        """Get products with URLs from a single pass over the products CSV."""
+        urls_by_name: Dict[str, List[URLEntry]] = {}
+        try:
+            with open(self.config.csv_products_path, "r", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    name = row.get("Product_Name", "").strip()
+                    url = row.get("URL", "").strip()
+                    if name and url:
+                        urls_by_name.setdefault(name, []).append(
+                            URLEntry(url=url, site_name=self._extract_site_name(url))
+                        )
+        except FileNotFoundError:
+            pass
+
+        return [
+            (product, urls_by_name.get(product.name, []))
+            for product in self._get_products_csv()
+        ]
+
+    def _get_products_with_urls_sqlite(
+        self,
+    ) -> List[Tuple[Product, List[URLEntry]]]:
+        """Get products with URLs from SQLite using one JOIN."""
+        with self._reader() as conn:
+            rows = conn.execute(_SQL_GET_PRODUCTS_WITH_URLS).fetchall()
+
+        products: Dict[int, Tuple[Product, List[URLEntry]]] = {}
+        for row in rows:
+            entry = products.get(row[0])
+            if entry is None:
+                entry = products[row[0]] = (self._row_to_product(row[:5]), [])
+            if row[5] is not None:
+                entry[1].append(self._row_to_url_entry(row[5:]))
+        return list(products.values())
 
     # Price history methods
     def add_price_entry(
@@ -336,61 +579,65 @@ class DatabaseManager:
         is_prime_eligible: bool = False,
     ) -> bool:
         """Add a price entry."""
+        return self.add_price_entries(
+            [
+                {
+                    "product_name": product_name,
+                    "url": url,
+                    "price": price,
+                    "scraped_at": scraped_at,
+                    "vendor_name": vendor_name,
+                    "vendor_url": vendor_url,
+                    "is_marketplace": is_marketplace,
+                    "is_prime_eligible": is_prime_eligible,
+                }
+            ]
+        )[0]
+
+    def add_price_entries(
+        self, entries: List[Dict[str, Any]], now: Optional[datetime] = None
+    ) -> List[bool]:
+        """Add several price entries in one batch.
+
+        Each entry is a dict using the keyword names of add_price_entry
+        (product_name, url and price are required). Entries without
+        scraped_at are stamped with ``now``. Returns one success flag per entry.
+        """
+        if not entries:
+            return []
+
+        now = now or datetime.now()
         if self.config.database_type == "csv":
-            return self._add_price_entry_csv(
-                product_name,
-                url,
-                price,
-                scraped_at,
-                vendor_name,
-                vendor_url,
-                is_marketplace,
-                is_prime_eligible,
-            )
+            return self._add_price_entries_csv(entries, now)
         else:
-            return self._add_price_entry_sqlite(
-                product_name,
-                url,
-                price,
-                scraped_at,
-                vendor_name,
-                vendor_url,
-                is_marketplace,
-                is_prime_eligible,
-            )
-
-    def _add_price_entry_csv(
-        self,
-        product_name: str,
-        url: str,
-        price: float,
-        scraped_at: Optional[datetime] = None,
-        vendor_name: Optional[str] = None,
-        vendor_url: Optional[str] = None,
-        is_marketplace: bool = False,
-        is_prime_eligible: bool = False,
-    ) -> bool:
-        """Add price entry to CSV."""
-        if scraped_at is None:
-            scraped_at = datetime.now()
-
-        row_dict = {
-            "Date": scraped_at.strftime("%Y-%m-%d"),
-            "Product_Name": product_name,
-            "URL": url,
-            "Price": price,
-            "Timestamp_ISO": scraped_at.isoformat(),
-        }
-
-        # Add vendor information if available
-        if vendor_name:
-            row_dict["Vendor_Name"] = vendor_name
-        if vendor_url:
-            row_dict["Vendor_URL"] = vendor_url
-        if is_marketplace:
-            row_dict["Is_Marketplace"] = is_marketplace
-        if is_prime_eligible:
-            row_dict["Is_Prime_Eligible"] = is_prime_eligible
+            return self._add_price_entries_sqlite(entries, now)
+
+    def _add_price_entries_csv(
+        self, entries: List[Dict[str, Any]], now: datetime
+    ) -> List[bool]:
+        """Append price entries to the CSV history in a single rewrite."""
+        new_rows = []
+        for entry in entries:
+            scraped_at = entry.get("scraped_at") or now
+            row_dict = {
+                "Date": scraped_at.strftime("%Y-%m-%d"),
+                "Product_Name": entry["product_name"],
+                "URL": entry["url"],
+                "Price": entry["price"],
+                "Timestamp_ISO": scraped_at.isoformat(),
+            }
+
+            # Add vendor information if available
+            if entry.get("vendor_name"):
+                row_dict["Vendor_Name"] = entry["vendor_name"]
+            if entry.get("vendor_url"):
+                row_dict["Vendor_URL"] = entry["vendor_url"]
+            if entry.get("is_marketplace"):
+                row_dict["Is_Marketplace"] = entry["is_marketplace"]
+            if entry.get("is_prime_eligible"):
+                row_dict["Is_Prime_Eligible"] = entry["is_prime_eligible"]
+
+            new_rows.append(row_dict)
 
         # Read existing data
         existing_data = []
@@ -401,189 +648,225 @@ class DatabaseManager:
         except FileNotFoundError:
             pass
 
-        # Add new row
-        existing_data.append(row_dict)
+        # Add new rows
+        existing_data.extend(new_rows)
 
         # Save back to CSV
         df = pd.DataFrame(existing_data)
         df.to_csv(self.config.csv_history_path, index=False, encoding="utf-8")
 
-        return True
+        return [True] * len(entries)
 
-    def _add_price_entry_sqlite(
-        self,
-        product_name: str,
-        url: str,
-        price: float,
-        scraped_at: Optional[datetime] = None,
-        vendor_name: Optional[str] = None,
-        vendor_url: Optional[str] = None,
-        is_marketplace: bool = False,
-        is_prime_eligible: bool = False,
-    ) -> bool:
-        """Add price entry to SQLite."""
-        if scraped_at is None:
-            scraped_at = datetime.now()
+    def _add_price_entries_sqlite(
+        self, entries: List[Dict[str, Any]], now: datetime
+    ) -> List[bool]:
+        """Insert price entries into SQLite with one executemany and one commit."""
+        names = list({entry["product_name"] for entry in entries})
+        placeholders = ",".join("?" * len(names))
 
         with self._get_connection() as conn:
-            # Get product ID
-            product_result = conn.execute(
-                "SELECT id FROM products WHERE name = ?", (product_name,)
-            ).fetchone()
-
-            if not product_result:
-                self.logger.warning(f"Product not found: {product_name}")
-                return False
+            # Resolve all product IDs in one query
+            product_ids = {
+                name: product_id
+                for name, product_id in conn.execute(
+                    f"SELECT name, id FROM products WHERE name IN ({placeholders})",
+                    names,
+                )
+            }
+
+            rows = []
+            results = []
+            for entry in entries:
+                product_id = product_ids.get(entry["product_name"])
+                if product_id is None:
+                    self.logger.warning(f"Product not found: {entry['product_name']}")
+                    results.append(False)
+                    continue
 
-            product_id = product_result[0]
-            site_name = self._extract_site_name(url)
+                rows.append(
+                    (
+                        product_id,
+                        entry["url"],
+                        entry["price"],
+                        entry.get("scraped_at") or now,
+                        self._extract_site_name(entry["url"]),
+                        entry.get("vendor_name"),
+                        entry.get("vendor_url"),
+                        entry.get("is_marketplace", False),
+                        entry.get("is_prime_eligible", False),
+                    )
+                )
+                results.append(True)
 
-            # Insert price entry
-            conn.execute(
-                """INSERT INTO price_history 
-                   (product_id, url, price, scraped_at, site_name, vendor_name, vendor_url, is_marketplace, is_prime_eligible) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    product_id,
-                    url,
-                    price,
-                    scraped_at,
-                    site_name,
-                    vendor_name,
-                    vendor_url,
-                    is_marketplace,
-                    is_prime_eligible,
-                ),
-            )
-            conn.commit()
+            if rows:
+                conn.executemany(_SQL_INSERT_PRICE, rows)
+                conn.commit()
 
-        return True
+        return results
 
-    def get_price_history(self, product_name: Optional[str] = None) -> pd.DataFrame:
-        """Get price history, optionally filtered by product."""
+    def get_price_history(
+        self,
+        product_name: Optional[str] = None,
+        parse_dates: bool = False,
+        chunksize: Optional[int] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """Get price history, optionally filtered by product.
+
+        With ``parse_dates`` the Timestamp_ISO column is returned as datetime64
+        instead of text. With ``chunksize`` an iterator of DataFrames holding
+        at most that many rows is returned instead of a single DataFrame.
+        """
         if self.config.database_type == "csv":
-            return self._get_price_history_csv(product_name)
+            return self._get_price_history_csv(product_name, parse_dates, chunksize)
         else:
-            return self._get_price_history_sqlite(product_name)
+            return self._get_price_history_sqlite(product_name, parse_dates, chunksize)
 
     def _get_price_history_csv(
-        self, product_name: Optional[str] = None
-    ) -> pd.DataFrame:
+        self,
+        product_name: Optional[str] = None,
+        parse_dates: bool = False,
+        chunksize: Optional[int] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Get price history from CSV."""
-        try:
-            df = pd.read_csv(self.config.csv_history_path, encoding="utf-8")
+
+        def prepare(df: pd.DataFrame) -> pd.DataFrame:
             if product_name:
                 df = df[df["Product_Name"] == product_name]
-            return df
+            return parse_history_timestamps(df) if parse_dates else df
+
+        try:
+            data = pd.read_csv(
+                self.config.csv_history_path, encoding="utf-8", chunksize=chunksize
+            )
         except FileNotFoundError:
-            return pd.DataFrame(
+            df = pd.DataFrame(
                 columns=["Date", "Product_Name", "URL", "Price", "Timestamp_ISO"]
             )
+            return iter([df]) if chunksize else df
+
+        if chunksize:
+            return (prepare(chunk) for chunk in data)
+        return prepare(data)
 
     def _get_price_history_sqlite(
-        self, product_name: Optional[str] = None
-    ) -> pd.DataFrame:
+        self,
+        product_name: Optional[str] = None,
+        parse_dates: bool = False,
+        chunksize: Optional[int] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Get price history from SQLite."""
-        with self._get_connection() as conn:
-            if product_name:
-                query = """
-                    SELECT 
-                        DATE(ph.scraped_at) as Date,
-                        p.name as Product_Name,
-                        ph.url as URL,
-                        ph.price as Price,
-                        ph.scraped_at as Timestamp_ISO
-                    FROM price_history ph
-                    JOIN products p ON ph.product_id = p.id
-                    WHERE p.name = ?
-                    ORDER BY ph.scraped_at
-                """
-                df = pd.read_sql_query(query, conn, params=(product_name,))
-            else:
-                query = """
-                    SELECT 
-                        DATE(ph.scraped_at) as Date,
-                        p.name as Product_Name,
-                        ph.url as URL,
-                        ph.price as Price,
-                        ph.scraped_at as Timestamp_ISO
-                    FROM price_history ph
-                    JOIN products p ON ph.product_id = p.id
-                    ORDER BY ph.scraped_at
-                """
-                df = pd.read_sql_query(query, conn)
+        if product_name:
+            query = _SQL_GET_PRICE_HISTORY.format(where="WHERE p.name = ?")
+            params = (product_name,)
+        else:
+            query = _SQL_GET_PRICE_HISTORY.format(where="")
+            params = None
+        if chunksize:
+            return self._iter_price_history_sqlite(
+                query, params, parse_dates, chunksize
+            )
 
-        return df
+        with self._reader() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        # Parsed like the CSV branch, so mixed time zones stay text
+        return parse_history_timestamps(df) if parse_dates else df
+
+    def _iter_price_history_sqlite(
+        self, query: str, params, parse_dates: bool, chunksize: int
+    ) -> Iterator[pd.DataFrame]:
+        """Yield history chunks from a connection of their own.
+
+        A partly consumed iterator keeps its read transaction open. On the
+        thread's cached reader that would pin a stale snapshot for later reads
+        and block WAL checkpoints, so a dedicated connection is used and closed
+        once the iterator is exhausted or discarded.
+        """
+        if self._ingest_conn is not None or self._is_in_memory():
+            with self._reader() as conn:
+                for chunk in pd.read_sql_query(
+                    query, conn, params=params, chunksize=chunksize
+                ):
+                    yield parse_history_timestamps(chunk) if parse_dates else chunk
+            return
+
+        conn = self._open_reader_connection()
+        try:
+            for chunk in pd.read_sql_query(
+                query, conn, params=params, chunksize=chunksize
+            ):
+                yield parse_history_timestamps(chunk) if parse_dates else chunk
+        finally:
+            conn.close()
 
     # Caching methods (SQLite only)
-    def is_url_cached(self, url: str) -> bool:
-        """Check if URL is cached and still valid."""
+    def is_url_cached(self, url: str, now: Optional[datetime] = None) -> bool:
+        """Check if URL is cached and still valid.
+
+        Pass ``now`` when checking many URLs in one round to reuse a single clock read.
+        """
         if self.config.database_type != "sqlite":
             return False
 
-        with self._get_connection() as conn:
-            result = conn.execute(
-                """SELECT last_scraped, cache_duration_hours, status, next_retry
-                   FROM cache WHERE url = ?""",
-                (url,),
-            ).fetchone()
+        now = now or datetime.now()
+
+        with self._reader() as conn:
+            result = conn.execute(_SQL_GET_CACHE_ENTRY, (url,)).fetchone()
 
             if not result:
                 return False
 
-            last_scraped = datetime.fromisoformat(result["last_scraped"])
-            cache_duration = timedelta(hours=result["cache_duration_hours"])
-            status = result["status"]
-            next_retry = result["next_retry"]
+            last_scraped_str, cache_hours, status, next_retry = result
+            last_scraped = datetime.fromisoformat(last_scraped_str)
+            cache_duration = timedelta(hours=cache_hours)
 
             # For successful cache entries
             if status == "success":
-                return datetime.now() < (last_scraped + cache_duration)
+                return now < (last_scraped + cache_duration)
 
             # For failed entries, check retry time
             if status == "failed" and next_retry:
-                return datetime.now() < datetime.fromisoformat(next_retry)
+                return now < datetime.fromisoformat(next_retry)
 
             return False
 
     def update_cache(
-        self, url: str, success: bool = True, next_retry: Optional[datetime] = None
+        self,
+        url: str,
+        success: bool = True,
+        next_retry: Optional[datetime] = None,
+        now: Optional[datetime] = None,
     ):
-        """Update cache entry for URL."""
+        """Update cache entry for URL.
+
+        Pass ``now`` when updating many URLs in one round to reuse a single clock read.
+        """
         if self.config.database_type != "sqlite":
             return
 
-        with self._get_connection() as conn:
-            # Get existing cache entry
-            existing = conn.execute(
-                "SELECT attempts FROM cache WHERE url = ?", (url,)
-            ).fetchone()
-            attempts = (existing["attempts"] if existing else 0) + 1
-
-            status = "success" if success else "failed"
-            cache_duration = (
-                self.config.cache_duration_hours
-                if success
-                else self.config.failed_cache_duration_hours
-            )
+        now = now or datetime.now()
+        cache_duration = (
+            self.config.cache_duration_hours
+            if success
+            else self.config.failed_cache_duration_hours
+        )
 
-            if not success and not next_retry:
-                # Exponential backoff: 1h, 2h, 4h, 8h, 24h max
-                backoff_hours = min(2 ** (attempts - 1), 24)
-                next_retry = datetime.now() + timedelta(hours=backoff_hours)
+        # Without an explicit retry time, failures back off exponentially;
+        # a first failure waits 1h, repeat failures are handled in SQL
+        backoff = not success and not next_retry
+        if backoff:
+            next_retry = now + timedelta(hours=1)
 
+        with self._get_connection() as conn:
             conn.execute(
-                """INSERT OR REPLACE INTO cache 
-                   (url, last_scraped, cache_duration_hours, status, attempts, next_retry)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (
-                    url,
-                    datetime.now(),
-                    cache_duration,
-                    status,
-                    attempts,
-                    next_retry.isoformat() if next_retry else None,
-                ),
+                _SQL_UPSERT_CACHE,
+                {
+                    "url": url,
+                    "now": now,
+                    "duration": cache_duration,
+                    "status": "success" if success else "failed",
+                    "next_retry": next_retry,
+                    "backoff": backoff,
+                },
             )
             conn.commit()
 
@@ -619,19 +902,23 @@ class DatabaseManager:
         recently_scraped = set()
         try:
             df = pd.read_csv(self.config.csv_history_path, encoding="utf-8")
-            for _, row in df.iterrows():
+            columns = ["Timestamp_ISO", "Product_Name", "URL"]
+            # Plain tuples rather than one Series per row as iterrows builds
+            for timestamp, name, url in df.reindex(columns=columns).itertuples(
+                index=False, name=None
+            ):
                 scraped_at = None
-                if not pd.isna(row.get("Timestamp_ISO")):
+                if not pd.isna(timestamp):
                     try:
                         scraped_at = datetime.fromisoformat(
-                            row["Timestamp_ISO"].replace("Z", "+00:00")
+                            timestamp.replace("Z", "+00:00")
                         )
                     except:
                         pass
 
                 if scraped_at and scraped_at > cutoff_time:
-                    name = row.get("Product_Name", "").strip()
-                    url = row.get("URL", "").strip()
+                    name = name.strip() if isinstance(name, str) else ""
+                    url = url.strip() if isinstance(url, str) else ""
                     if name and url:
                         recently_scraped.add((name, url))
         except FileNotFoundError:
@@ -645,24 +932,24 @@ class DatabaseManager:
         """Get products needing scrape from SQLite."""
         cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
 
-        with self._get_connection() as conn:
-            # Get products with no recent price entries
+        with self._reader() as conn:
+            # Get products with no recent price entries; the anti-join is
+            # answered from idx_price_history_lookup
             query = """
                 SELECT DISTINCT p.name, u.url
                 FROM products p
                 JOIN urls u ON p.id = u.product_id
-                WHERE u.active = 1
-                AND NOT EXISTS (
-                    SELECT 1 FROM price_history ph 
-                    WHERE ph.product_id = p.id 
-                    AND ph.url = u.url 
+                LEFT JOIN price_history ph
+                    ON ph.product_id = p.id
+                    AND ph.url = u.url
                     AND ph.scraped_at > ?
-                )
+                WHERE u.active = 1
+                AND ph.id IS NULL
                 ORDER BY p.name, u.site_name
             """
 
             rows = conn.execute(query, (cutoff_time,)).fetchall()
-            return [(row["name"], row["url"]) for row in rows]
+            return [(row[0], row[1]) for row in rows]
 
     # Export methods for backward compatibility
     def export_to_csv(self):
@@ -672,29 +959,19 @@ class DatabaseManager:
             return
 
         # Export products
-        products = []
         with self._get_connection() as conn:
-            rows = conn.execute(
+            df_products = pd.read_sql_query(
                 """
-                SELECT p.name, p.category, u.url
+                SELECT u.url AS URL, p.name AS Product_Name, p.category AS Category
                 FROM products p
                 JOIN urls u ON p.id = u.product_id
                 WHERE u.active = 1
                 ORDER BY p.name, u.site_name
-            """
-            ).fetchall()
-
-            for row in rows:
-                products.append(
-                    {
-                        "URL": row["url"],
-                        "Product_Name": row["name"],
-                        "Category": row["category"],
-                    }
-                )
+            """,
+                conn,
+            )
 
         # Save products CSV
-        df_products = pd.DataFrame(products)
         df_products.to_csv(self.config.csv_products_path, index=False, encoding="utf-8")
 
         # Export price history
@@ -714,36 +991,68 @@ class DatabaseManager:
         error_message: str = None,
         http_status_code: int = None,
     ):
-        """Log a product issue to the database."""
+        """Queue a product issue; issues are written in batches by flush_issues."""
         if self.config.database_type != "sqlite":
             return  # Only available for SQLite
 
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO product_issues 
-                (product_id, url, issue_type, expected_name, actual_name, error_message, http_status_code)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    product_id,
-                    url,
-                    issue_type,
-                    expected_name,
-                    actual_name,
-                    error_message,
-                    http_status_code,
-                ),
+        # Record detection time now, in the same format as CURRENT_TIMESTAMP
+        detected_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self._issue_buffer.append(
+            (
+                product_id,
+                url,
+                issue_type,
+                expected_name,
+                actual_name,
+                error_message,
+                http_status_code,
+                detected_at,
             )
-
+        )
         self.logger.info(f"Logged {issue_type} issue for product {product_id}: {url}")
 
+        if len(self._issue_buffer) >= ISSUE_FLUSH_THRESHOLD:
+            self.flush_issues()
+
+    def flush_issues(self):
+        """Write all buffered product issues in a single transaction."""
+        if not self._issue_buffer:
+            return
+
+        rows = list(self._issue_buffer)
+        self._issue_buffer.clear()
+        with self._get_connection() as conn:
+            conn.executemany(_SQL_INSERT_ISSUE, rows)
+            conn.commit()
+
+        self.logger.info(f"Flushed {len(rows)} product issues to the database")
+
+    def close(self):
+        """Flush pending writes and close cached reader connections.
+
+        Call once the scrape round is finished.
+        """
+        self.flush_issues()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._reader_local = threading.local()
+
+    def __enter__(self) -> "DatabaseManager":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Runs on errors too, so buffered issues are not lost
+        self.close()
+
     def get_product_issues(self, resolved: bool = None) -> List[dict]:
         """Get product issues from the database."""
         if self.config.database_type != "sqlite":
             return []
 
-        with self._get_connection() as conn:
+        self.flush_issues()
+        with self._reader() as conn:
             if resolved is None:
                 query = """
                     SELECT pi.*, p.name as product_name, p.category
@@ -769,10 +1078,12 @@ class DatabaseManager:
         if self.config.database_type != "sqlite":
             return
 
+        self.flush_issues()
         with self._get_connection() as conn:
             conn.execute(
                 "UPDATE product_issues SET resolved = 1 WHERE id = ?", (issue_id,)
             )
+            conn.commit()
 
         self.logger.info(f"Marked issue {issue_id} as resolved")
 
@@ -781,34 +1092,10 @@ class DatabaseManager:
         if self.config.database_type != "sqlite":
             return None
 
-        with self._get_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT p.id, p.name, p.category, p.created_at, p.updated_at
-                FROM products p
-                JOIN urls u ON p.id = u.product_id
-                WHERE u.url = ?
-            """,
-                (url,),
-            ).fetchone()
+        with self._reader() as conn:
+            row = conn.execute(_SQL_GET_PRODUCT_BY_URL, (url,)).fetchone()
 
-            if row:
-                return Product(
-                    id=row["id"],
-                    name=row["name"],
-                    category=row["category"],
-                    created_at=(
-                        datetime.fromisoformat(row["created_at"])
-                        if row["created_at"]
-                        else None
-                    ),
-                    updated_at=(
-                        datetime.fromisoformat(row["updated_at"])
-                        if row["updated_at"]
-                        else None
-                    ),
-                )
-            return None
+            return self._row_to_product(row) if row else None
 
     def deactivate_product_url(self, url: str, reason: str = "problematic"):
         """Deactivate a specific URL due to issues."""
@@ -829,17 +1116,18 @@ class DatabaseManager:
         if self.config.database_type != "sqlite":
             return
 
+        self.flush_issues()
         with self._get_connection() as conn:
             # Enable foreign keys for proper cascade delete
             conn.execute("PRAGMA foreign_keys = ON")
-            
+
             # Get product name for logging
             product_row = conn.execute(
                 "SELECT name FROM products WHERE id = ?", (product_id,)
             ).fetchone()
 
             if product_row:
-                product_name = product_row["name"]
+                product_name = product_row[0]
 
                 # Delete product (cascades to urls, price_history)
                 conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
@@ -177,10 +177,12 @@ CREATE INDEX IF NOT EXISTS idx_products_name ON products(name);
 CREATE INDEX IF NOT EXISTS idx_products_category ON products(category);
 CREATE INDEX IF NOT EXISTS idx_urls_product_id ON urls(product_id);
 CREATE INDEX IF NOT EXISTS idx_urls_site_name ON urls(site_name);
+CREATE INDEX IF NOT EXISTS idx_urls_product_active ON urls(product_id, active);
 CREATE INDEX IF NOT EXISTS idx_price_history_product_id ON price_history(product_id);
 CREATE INDEX IF NOT EXISTS idx_price_history_scraped_at ON price_history(scraped_at);
 CREATE INDEX IF NOT EXISTS idx_price_history_site_name ON price_history(site_name);
 CREATE INDEX IF NOT EXISTS idx_price_history_vendor_name ON price_history(vendor_name);
+CREATE INDEX IF NOT EXISTS idx_price_history_lookup ON price_history(product_id, url, scraped_at);
 CREATE INDEX IF NOT EXISTS idx_cache_url ON cache(url);
 CREATE INDEX IF NOT EXISTS idx_cache_last_scraped ON cache(last_scraped);
 CREATE INDEX IF NOT EXISTS idx_cache_status ON cache(status);
@@ -1,19 +1,44 @@
-from htmlgen.data import load_products, load_history
-from htmlgen.normalize import normalize_price, get_category, get_site_label
+from htmlgen.data import (
+    load_products,
+    load_history,
+    group_history_by_product,
+    encode_history_keys,
+    timestamp_column,
+)
+from htmlgen.normalize import (
+    normalize_price_series,
+    add_normalized_prices,
+    get_category,
+    get_site_label,
+)
 from htmlgen.render import render_summary_table, render_product_cards
-from htmlgen.graph import render_all_price_graphs
-from utils import format_french_date
+from htmlgen.graph import to_script_json
+from utils import format_french_dates
 from database import DatabaseManager, DatabaseConfig
 from pathlib import Path
-import os
+import glob
+import hashlib
+from functools import lru_cache
+from itertools import cycle
 import json
+import os
+import numpy as np
+import pandas as pd
 
 
 PRODUCTS_CSV = "produits.csv"
+# History columns whose content feeds the rendered page
+HISTORY_FINGERPRINT_COLUMNS = ["Product_Name", "URL", "Price", "Timestamp_ISO", "Date"]
 
 
+@lru_cache(maxsize=1)
 def get_database_manager():
-    """Get database manager instance based on configuration."""
+    """Get database manager instance based on configuration.
+
+    Built once per process: the config file is read and the schema checked
+    only on the first call. The manager keeps one reader connection per
+    thread, so sharing it is safe; close() leaves it reusable.
+    """
     config_path = "database.conf"
     if Path(config_path).exists():
         db_config = DatabaseConfig.from_config_file(config_path)
@@ -24,121 +49,127 @@ def get_database_manager():
 
 
 def normalize_and_filter_prices(entries, name):
-    valid_entries = []
-    for entry in entries:
-        try:
-            norm_price = normalize_price(entry["price"], name)
-            price_val = float(norm_price)
-            if 0 < price_val < 5000:
-                valid_entries.append({"price": norm_price, "url": entry["url"]})
-        except Exception:
-            continue
-    return valid_entries
+    if not entries:
+        return []
+    prices = pd.Series([entry["price"] for entry in entries], dtype=object)
+    norm = normalize_price_series(prices, pd.Series(name, index=prices.index))
+    # Unparseable prices are NaN and fail the range check
+    rounded = norm.round(2)
+    valid = ((rounded > 0) & (rounded < 5000)).to_numpy()
+    return [
+        {"price": f"{price:.2f}", "url": entry["url"]}
+        for price, entry, ok in zip(norm.to_numpy(), entries, valid)
+        if ok
+    ]
 
 
 def get_category_best(product_prices):
-    category_best = {}
-
     # Try to get products from database first, fallback to CSV
     try:
         db_manager, db_config = get_database_manager()
         if db_config.database_type == "sqlite":
-            products_list = db_manager.get_products()
-            products_data = {}
-            for product in products_list:
-                urls = db_manager.get_product_urls(product.name)
-                products_data[product.name] = {
-                    "category": product.category,
-                    "urls": [url.url for url in urls],
-                }
+            # Only the category is used below, so skip the per-product URL queries
+            products_data = {
+                product.name: {"category": product.category}
+                for product in db_manager.get_products()
+            }
+            db_manager.close()
         else:
             products_data = load_products(PRODUCTS_CSV)
     except Exception:
         # Fallback to CSV
         products_data = load_products(PRODUCTS_CSV)
 
+    candidates = []
     for name, entries in product_prices.items():
         valid_entries = normalize_and_filter_prices(entries, name)
         if not valid_entries:
             continue
-        best = min(valid_entries, key=lambda x: float(x["price"]))
+        product_prices[name] = valid_entries
 
         # Get explicit category from CSV, fallback to heuristic
         product_data = products_data.get(name, {})
-        cat = product_data.get("category", get_category(name, best["url"]))
+        cat = product_data.get("category")
+        if cat is None:
+            cat = get_category(name, valid_entries[0]["url"])
 
         # Exclude "Upgrade Kit" from total price calculations
         if cat == "Upgrade Kit":
-            product_prices[name] = valid_entries
             continue
 
-        if cat not in category_best or float(best["price"]) < float(
-            category_best[cat]["price"]
-        ):
-            category_best[cat] = {
-                "name": name,
-                "price": best["price"],
-                "url": best["url"],
-            }
-        product_prices[name] = valid_entries
+        candidates.extend(
+            (cat, name, entry["price"], entry["url"]) for entry in valid_entries
+        )
+
+    if not candidates:
+        return {}, product_prices
+
+    # Cheapest entry per category; idxmin keeps the first product on ties
+    df = pd.DataFrame(candidates, columns=["category", "name", "price", "url"])
+    df["price_val"] = df["price"].astype(float)
+    best = df.loc[df.groupby("category", sort=False)["price_val"].idxmin()]
+    category_best = {
+        cat: {"name": name, "price": price, "url": url}
+        for cat, name, price, url in zip(
+            best["category"], best["name"], best["price"], best["url"]
+        )
+    }
     return category_best, product_prices
 
 
-def extract_timestamps(history):
-    if "Timestamp_ISO" in history.columns:
-        ts_col = history["Timestamp_ISO"]
-    else:
-        ts_col = history["Date"]
-    return sorted(
-        {str(ts) for ts in ts_col if isinstance(ts, str) and ts.strip() and ts != "nan"}
+def extract_timestamps(history, ts_col_name=None):
+    ts_col = history[ts_col_name or timestamp_column(history)]
+    ts_col = ts_col.dropna()
+    if not pd.api.types.is_datetime64_any_dtype(ts_col):
+        if not pd.api.types.is_string_dtype(ts_col):
+            # Mixed column: only text timestamps count
+            ts_col = ts_col[[isinstance(ts, str) for ts in ts_col]].astype(str)
+        ts_col = ts_col[(ts_col.str.strip() != "") & (ts_col != "nan")]
+    return ts_col.drop_duplicates().sort_values().tolist()
+
+
+def get_best_price_series(category_best, history, ts_col=None):
+    """Best valid normalized price per (product, timestamp) for the category winners."""
+    ts_col = ts_col or timestamp_column(history)
+    names = [info["name"] for info in category_best.values()]
+    rows = add_normalized_prices(history[history["Product_Name"].isin(names)])
+    prices = rows["Price_norm"].round(2)
+    valid = (prices > 0) & (prices < 5000)
+    return (
+        prices[valid].groupby([rows["Product_Name"], rows[ts_col]], observed=True).min()
     )
 
 
-def get_product_min_price_series(category_best, history, timestamps):
-    product_min_prices = {}
-    for cat, info in category_best.items():
-        name = info["name"]
-        product_history = history[history["Product_Name"] == name]
-        ts_col_name = (
-            "Timestamp_ISO" if "Timestamp_ISO" in product_history.columns else "Date"
-        )
-        product_history = product_history.sort_values(by=ts_col_name)
-        prices = []
-        ts_labels = []
-        for ts, group in product_history.groupby(ts_col_name):
-            valid_prices = [
-                float(normalize_price(row["Price"], name))
-                for _, row in group.iterrows()
-                if 0 < float(normalize_price(row["Price"], name)) < 5000
-            ]
-            if valid_prices:
-                min_price = min(valid_prices)
-                prices.append(min_price)
-                ts_labels.append(ts)
-        product_min_prices[name] = {"timestamps": ts_labels, "prices": prices}
-    return product_min_prices
+def get_product_min_price_series(category_best, best_prices):
+    """Best price per timestamp (rows) for every category winner (columns).
+
+    Products with no valid price get an all-NaN column.
+    """
+    names = list(dict.fromkeys(info["name"] for info in category_best.values()))
+    table = best_prices.unstack(level=0) if not best_prices.empty else pd.DataFrame()
+    return table.reindex(columns=names)
 
 
 def get_total_price_history(product_min_prices, timestamps):
-    total_history = []
-    absolute_best = {}
-    for name, ts_price_dict in product_min_prices.items():
-        prices = [p for p in ts_price_dict.values() if p is not None and p > 0]
-        min_price = min(prices) if prices else 0
-        absolute_best[name] = min_price
-    for i, ts in enumerate(timestamps):
-        total = 0
-        for name, ts_price_dict in product_min_prices.items():
-            if i == len(timestamps) - 1:
-                total += absolute_best.get(name, 0)
-            else:
-                total += (
-                    ts_price_dict.get(ts, 0)
-                    if ts_price_dict.get(ts, 0) is not None
-                    else 0
-                )
-        total_history.append({"timestamp": ts, "total": round(total, 2)})
-    return total_history, absolute_best
+    """Sum the best price of every product per timestamp.
+
+    Products without a price at a timestamp count as 0; the last timestamp
+    uses each product's all-time best price instead.
+    """
+    # All-time best per product, over every scraped timestamp
+    absolute_best = (
+        product_min_prices.where(product_min_prices > 0).min(axis=0).fillna(0.0)
+    )
+    # One NaN-skipping sum over the timestamp x product array
+    values = product_min_prices.reindex(timestamps).to_numpy(dtype=float)
+    totals = np.nansum(values, axis=1)
+    if totals.size:
+        totals[-1] = absolute_best.sum()
+    total_history = [
+        {"timestamp": ts, "total": round(total, 2)}
+        for ts, total in zip(timestamps, totals.tolist())
+    ]
+    return total_history, absolute_best.to_dict()
 
 
 def _get_evolution_html(total_history):
@@ -156,32 +187,36 @@ def _get_evolution_html(total_history):
 
 
 def _get_formatted_labels(total_history):
-    return [format_french_date(x["timestamp"]) for x in total_history]
+    return format_french_dates(x["timestamp"] for x in total_history)
+
+
+# Line colors for the per-product datasets, reused in order
+PRODUCT_GRAPH_COLORS = (
+    "#06b6d4",
+    "#f59e42",
+    "#ef4444",
+    "#8b5cf6",
+    "#10b981",
+    "#f43f5e",
+    "#eab308",
+    "#84cc16",
+    "#14b8a6",
+    "#ec4899",
+)
 
 
 def _get_product_graph_datasets(product_min_prices, total_history):
-    colors = [
-        "#06b6d4",
-        "#f59e42",
-        "#ef4444",
-        "#8b5cf6",
-        "#10b981",
-        "#f43f5e",
-        "#eab308",
-        "#84cc16",
-        "#14b8a6",
-        "#ec4899",
-    ]
     datasets = []
-    for idx, (name, data) in enumerate(product_min_prices.items()):
-        if data["timestamps"] and data["prices"]:
+    for name, color in zip(product_min_prices.columns, cycle(PRODUCT_GRAPH_COLORS)):
+        prices = product_min_prices[name].dropna()
+        if not prices.empty:
             datasets.append(
                 {
                     "label": name,
-                    "data": data["prices"],
+                    "data": prices.tolist(),
                     "fill": False,
-                    "borderColor": colors[idx % len(colors)],
-                    "backgroundColor": colors[idx % len(colors)],
+                    "borderColor": color,
+                    "backgroundColor": color,
                     "borderWidth": 2,
                     "tension": 0.4,
                     "pointRadius": 0,
@@ -205,50 +240,9 @@ def _get_product_graph_datasets(product_min_prices, total_history):
     return datasets
 
 
-def _render_html(
-    category_products, history, product_prices, product_min_prices, total_history
-):
-    formatted_labels = _get_formatted_labels(total_history)
-    product_graph_datasets = _get_product_graph_datasets(
-        product_min_prices, total_history
-    )
-    chart_config = {
-        "type": "line",
-        "data": {"labels": formatted_labels, "datasets": product_graph_datasets},
-        "options": {
-            "responsive": True,
-            "plugins": {
-                "legend": {
-                    "display": True,
-                    "labels": {"color": "#e2e8f0", "font": {"size": 12}},
-                },
-                "title": {
-                    "display": True,
-                    "text": "Historique du prix total",
-                    "color": "#06b6d4",
-                    "font": {"size": 16, "weight": "bold"},
-                },
-            },
-            "scales": {
-                "x": {
-                    "ticks": {"color": "#94a3b8", "font": {"size": 10}},
-                    "grid": {"color": "rgba(148, 163, 184, 0.1)"},
-                },
-                "y": {
-                    "beginAtZero": False,
-                    "ticks": {"color": "#94a3b8", "font": {"size": 10}},
-                    "grid": {"color": "rgba(148, 163, 184, 0.1)"},
-                },
-            },
-            "elements": {
-                "point": {"hoverBackgroundColor": "#06b6d4"},
-                "line": {"borderCapStyle": "round"},
-            },
-        },
-    }
-    chart_json = json.dumps(chart_config)
-    evolution_html = _get_evolution_html(total_history)
-    html = [
+# Static page start, up to the page title
+_HTML_HEAD = "\n".join(
+    [
         "<!DOCTYPE html>",
         '<html lang="fr">',
         "<head>",
@@ -291,21 +285,71 @@ def _render_html(
         '<body class="bg-slate-900 font-inter min-h-screen">',
         '<div class="main-content px-4 py-8">',
         '<h1 class="text-5xl font-extrabold text-center gradient-text mb-12 tracking-tight">Product Price Tracker</h1>',
-        evolution_html,
-        '<div id="total-warning"></div>',
-        '<div class="chart-container mt-8 mb-8"><h2 class="text-2xl font-bold text-center text-cyan-400 mb-6">Historique du prix total</h2><canvas id="total_price_chart" height="150"></canvas>'
-        f"<script>\n"
-        f'const ctx = document.getElementById("total_price_chart").getContext("2d");\n'
-        f"new Chart(ctx, {chart_json});\n"
-        f"</script></div>",
     ]
-    html.append(render_summary_table(category_products, history))
-    # Call render_product_cards - historical prices are now toggleable with buttons
-    html.append(render_product_cards(product_prices, history, product_min_prices))
+)
+
+# Static options of the total price chart, serialized once at import; only
+# the labels and datasets change between renders
+_TOTAL_CHART_OPTIONS_JSON = to_script_json(
+    {
+        "responsive": True,
+        "plugins": {
+            "legend": {
+                "display": True,
+                "labels": {"color": "#e2e8f0", "font": {"size": 12}},
+            },
+            "title": {
+                "display": True,
+                "text": "Historique du prix total",
+                "color": "#06b6d4",
+                "font": {"size": 16, "weight": "bold"},
+            },
+        },
+        "scales": {
+            "x": {
+                "ticks": {"color": "#94a3b8", "font": {"size": 10}},
+                "grid": {"color": "rgba(148, 163, 184, 0.1)"},
+            },
+            "y": {
+                "beginAtZero": False,
+                "ticks": {"color": "#94a3b8", "font": {"size": 10}},
+                "grid": {"color": "rgba(148, 163, 184, 0.1)"},
+            },
+        },
+        "elements": {
+            "point": {"hoverBackgroundColor": "#06b6d4"},
+            "line": {"borderCapStyle": "round"},
+        },
+    }
+)
+
+
+def _total_chart_json(labels, datasets):
+    """Total price chart config as inline-safe JSON."""
+    return (
+        '{"type":"line","data":{"labels":'
+        + to_script_json(labels)
+        + ',"datasets":'
+        + to_script_json(datasets)
+        + '},"options":'
+        + _TOTAL_CHART_OPTIONS_JSON
+        + "}"
+    )
+
 
-    # Inline JavaScript for toggle functionality to keep a single self-contained HTML
-    html.append(
-        """
+# Evolution banner and total price chart, filled in by _render_html
+_TOTAL_SECTION_TEMPLATE = (
+    "{evolution}\n"
+    '<div id="total-warning"></div>\n'
+    '<div class="chart-container mt-8 mb-8"><h2 class="text-2xl font-bold text-center text-cyan-400 mb-6">Historique du prix total</h2><canvas id="total_price_chart" height="150"></canvas>'
+    "<script>\n"
+    'const ctx = document.getElementById("total_price_chart").getContext("2d");\n'
+    "new Chart(ctx, {chart});\n"
+    "</script></div>"
+)
+
+# Inline JavaScript for toggle functionality to keep a single self-contained HTML
+_TOGGLE_HISTORY_JS = """
 <script>
 // Toggle visibility of price history sections (inlined)
 function toggleHistory(historyId) {
@@ -331,141 +375,214 @@ function toggleHistory(historyId) {
 }
 </script>
 """
-    )
 
-    html.append("</body></html>")
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_path = os.path.join(project_root, "output.html")
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(html))
+
+def _render_html(
+    category_products,
+    history,
+    product_prices,
+    product_min_prices,
+    total_history,
+    history_by_product,
+):
+    formatted_labels = _get_formatted_labels(total_history)
+    product_graph_datasets = _get_product_graph_datasets(
+        product_min_prices, total_history
+    )
+    chart_json = _total_chart_json(formatted_labels, product_graph_datasets)
+    evolution_html = _get_evolution_html(total_history)
+    output_path = _get_output_path()
+    # Stream each fragment to disk as soon as it is rendered instead of
+    # holding the whole page in memory; fragments are newline-separated.
+    # newline="" disables newline translation, so the bytes match everywhere
+    with open(output_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        write = f.write
+        write(_HTML_HEAD)
+        write("\n")
+        write(
+            _TOTAL_SECTION_TEMPLATE.format(evolution=evolution_html, chart=chart_json)
+        )
+        write("\n")
+        render_summary_table(
+            category_products, history, history_by_product=history_by_product, out=f
+        )
+        write("\n")
+        # Historical prices are toggleable with buttons
+        render_product_cards(
+            product_prices,
+            history,
+            product_min_prices,
+            history_by_product=history_by_product,
+            out=f,
+        )
+        write("\n")
+        write(_TOGGLE_HISTORY_JS)
+        write("\n</body></html>")
     print(f"[generate_html.py] HTML file written to: {output_path}")
 
 
-def _get_latest_price_for_url(history, name, url):
+def _get_latest_prices(history):
     """
-    Extract the latest valid price for a specific product and URL.
+    Extract the latest valid price for every (product, URL) pair in one pass.
     Parameters:
         history (pandas.DataFrame): DataFrame containing price history data.
-        name (str): The name of the product.
-        url (str): The URL of the product.
     Returns:
-        dict or None: Returns a dictionary with keys 'price' and 'url' if a valid price is found.
-        Returns None if no valid price entry exists for the given product and URL.
+        dict: Maps (product_name, url) to the latest scraped price. Pairs whose
+        latest price is missing or an outlier are left out.
     """
-    rows = history[(history["Product_Name"] == name) & (history["URL"] == url)]
-    if rows.empty:
-        return None
-
-    # Sort by timestamp (use Timestamp_ISO if available, otherwise Date)
-    timestamp_col = "Timestamp_ISO" if "Timestamp_ISO" in rows.columns else "Date"
-    rows = rows.sort_values(by=timestamp_col, ascending=False)
-    latest = rows.iloc[0]
+    # Sort by timestamp (use Timestamp_ISO if available, otherwise Date);
+    # rows without a timestamp sort first so they only win when alone
+    timestamp_col = timestamp_column(history)
+    latest = history.sort_values(
+        by=timestamp_col, kind="stable", na_position="first"
+    ).drop_duplicates(["Product_Name", "URL"], keep="last")
 
     # Validate price
-    try:
-        price_val = float(latest["Price"])
-        if 0 < price_val < 5000:  # Filter outliers
-            return {"price": latest["Price"], "url": url}
-    except (ValueError, TypeError):
-        pass
+    price_vals = pd.to_numeric(latest["Price"], errors="coerce")
+    latest = latest[(price_vals > 0) & (price_vals < 5000)]  # Filter outliers
 
-    return None
+    return dict(
+        zip(
+            zip(latest["Product_Name"].to_numpy(), latest["URL"].to_numpy()),
+            latest["Price"].to_numpy(),
+        )
+    )
 
 
 def build_product_prices(products, history):
     """Build product prices dictionary from products and history data."""
     product_prices = {}
+    latest_prices = _get_latest_prices(history)
 
     for name, product_data in products.items():
-        urls = product_data["urls"]
-        entries = []
-        for url in urls:
-            price_entry = _get_latest_price_for_url(history, name, url)
-            if price_entry:
-                entries.append(price_entry)
-
+        entries = [
+            {"price": latest_prices[(name, url)], "url": url}
+            for url in product_data["urls"]
+            if (name, url) in latest_prices
+        ]
         if entries:
             product_prices[name] = entries
 
     return product_prices
 
 
-def _build_category_products_with_explicit_categories(product_prices):
-    """Build category_products with explicit categories from CSV, removing duplicates."""
-    from collections import defaultdict
+def _build_category_products(product_prices):
+    """Build category_products with explicit categories from CSV.
 
-    category_products = defaultdict(list)
-    # Load products data again to get explicit categories
+    Keeps only the cheapest entry per product while grouping, so each price
+    is parsed once and no duplicate list is built and collapsed afterwards.
+    """
     products_data = load_products(PRODUCTS_CSV)
 
+    # category -> product name -> (price, product dict)
+    cheapest = {}
     for name, entries in product_prices.items():
-        # Get the explicit category from CSV
-        product_data = products_data.get(name, {})
-        cat = product_data.get("category", "Other")
-
+        if not entries:
+            continue
+        cat = products_data.get(name, {}).get("category", "Other")
+        groups = cheapest.setdefault(cat, {})
         for entry in entries:
-            category_products[cat].append(
-                {"name": name, "price": entry["price"], "url": entry["url"]}
-            )
+            price = float(entry["price"])
+            kept = groups.get(name)
+            if kept is None or price < kept[0]:
+                groups[name] = (
+                    price,
+                    {"name": name, "price": entry["price"], "url": entry["url"]},
+                )
 
     # Sort each category's products by price ascending (cheapest first)
-    for cat in category_products:
-        category_products[cat].sort(key=lambda x: float(x["price"]))
-
-    return category_products
-
-
-def _remove_duplicates_within_categories(category_products):
-    """Remove duplicate products within each category, keeping the cheapest."""
-    for cat in category_products:
-        # Group by product name and keep the cheapest
-        product_groups = {}
-        for product in category_products[cat]:
-            name = product["name"]
-            if name not in product_groups or float(product["price"]) < float(
-                product_groups[name]["price"]
-            ):
-                product_groups[name] = product
-
-        # Convert back to list, sorted by price
-        category_products[cat] = sorted(
-            product_groups.values(), key=lambda x: float(x["price"])
+    return {
+        cat: [product for _, product in sorted(groups.values(), key=lambda x: x[0])]
+        for cat, groups in cheapest.items()
+    }
+
+
+def _get_output_path():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, "output.html")
+
+
+def _render_fingerprint(category_best, product_prices, history):
+    """
+    Digest of everything the rendered page depends on.
+    Covers the selected products and prices, the full price history, the
+    product catalog and the generator and formatting sources, so an unchanged
+    digest means output.html would come out identical.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        json.dumps([category_best, product_prices], sort_keys=True, default=str).encode(
+            "utf-8"
         )
+    )
+    columns = [c for c in HISTORY_FINGERPRINT_COLUMNS if c in history.columns]
+    hashed = pd.util.hash_pandas_object(history[columns], index=False)
+    digest.update(hashed.to_numpy().tobytes())
+    src_dir = os.path.dirname(__file__)
+    # utils formats the dates and prices shown on the page
+    sources = [__file__, PRODUCTS_CSV, os.path.join(src_dir, "utils", "__init__.py")]
+    sources += glob.glob(os.path.join(src_dir, "htmlgen", "*.py"))
+    # Contents, not mtimes: touching or re-copying an unchanged file keeps the cache
+    for path in sorted(sources):
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            continue
+        digest.update(os.path.basename(path).encode("utf-8"))
+        digest.update(hashlib.blake2b(content, digest_size=16).digest())
+    return digest.hexdigest()
 
-    return category_products
+
+def _is_render_up_to_date(output_path, fingerprint):
+    try:
+        with open(output_path + ".hash", encoding="utf-8") as f:
+            stored = f.read().strip()
+    except OSError:
+        return False
+    return stored == fingerprint and os.path.exists(output_path)
 
 
 def generate_html(product_prices, history):
-    # Ensure all helpers are defined before use
+    # Encode the lookup keys and normalize every history price once;
+    # later steps reuse the codes and Price_norm
+    history = add_normalized_prices(encode_history_keys(history))
     # Get best product per category and normalized product_prices
     category_best, product_prices = get_category_best(product_prices)
-    timestamps = extract_timestamps(history)
-    product_min_prices = get_product_min_price_series(
-        category_best, history, timestamps
-    )
-    total_history, _ = get_total_price_history(
-        {
-            name: dict(zip(data["timestamps"], data["prices"]))
-            for name, data in product_min_prices.items()
-        },
-        timestamps,
-    )
+
+    # Skip rendering entirely when nothing the page depends on has changed
+    output_path = _get_output_path()
+    fingerprint = _render_fingerprint(category_best, product_prices, history)
+    if _is_render_up_to_date(output_path, fingerprint):
+        print(f"[generate_html.py] {output_path} is up to date, skipping render")
+        return
+
+    # Resolve the timestamp column once for the helpers below
+    ts_col = timestamp_column(history)
+    timestamps = extract_timestamps(history, ts_col)
+    best_prices = get_best_price_series(category_best, history, ts_col)
+    product_min_prices = get_product_min_price_series(category_best, best_prices)
+    total_history, _ = get_total_price_history(product_min_prices, timestamps)
 
     # Build category_products: category → list of product dicts (sorted by price)
-    category_products = _build_category_products_with_explicit_categories(
-        product_prices
-    )
-    category_products = _remove_duplicates_within_categories(category_products)
+    category_products = _build_category_products(product_prices)
 
     _render_html(
-        category_products, history, product_prices, product_min_prices, total_history
+        category_products,
+        history,
+        product_prices,
+        product_min_prices,
+        total_history,
+        group_history_by_product(history),
     )
+    with open(output_path + ".hash", "w", encoding="utf-8") as f:
+        f.write(fingerprint)
 
 
 def main():
     """Main function to orchestrate HTML generation from scraped data."""
     products = load_products(PRODUCTS_CSV)
-    history = load_history("historique_prix.csv")
+    history = load_history("historique_prix.csv", parse_dates=True)
     product_prices = build_product_prices(products, history)
     generate_html(product_prices, history)
 
@@ -5,6 +5,8 @@ Data loading and preprocessing for HTML generation.
 import pandas as pd
 import csv
 
+from database import parse_history_timestamps
+
 
 def load_products(csv_path):
     products = {}
@@ -29,5 +31,35 @@ def load_products(csv_path):
     return products
 
 
-def load_history(csv_path):
-    return pd.read_csv(csv_path, encoding="utf-8")
+def load_history(csv_path, parse_dates=False):
+    """Load the price history CSV.
+
+    With parse_dates, Timestamp_ISO is parsed to datetime64 once here so sorts,
+    groupbys and label formatting downstream work on native datetimes; it is
+    left as text when it does not parse or mixes time zones (see
+    database.parse_history_timestamps).
+    """
+    history = pd.read_csv(csv_path, encoding="utf-8")
+    return parse_history_timestamps(history) if parse_dates else history
+
+
+def timestamp_column(history):
+    """Name of the history timestamp column: Timestamp_ISO, or Date for old files."""
+    return "Timestamp_ISO" if "Timestamp_ISO" in history.columns else "Date"
+
+
+def encode_history_keys(history):
+    """Return history with Product_Name and URL as categoricals.
+
+    Equality filters and groupbys on these columns then compare integer codes
+    instead of Python strings.
+    """
+    keys = [c for c in ("Product_Name", "URL") if c in history.columns]
+    if all(isinstance(history[c].dtype, pd.CategoricalDtype) for c in keys):
+        return history
+    return history.astype({c: "category" for c in keys})
+
+
+def group_history_by_product(history):
+    """Split history into one DataFrame per product name in a single pass."""
+    return dict(list(history.groupby("Product_Name", sort=False, observed=True)))
@@ -2,9 +2,15 @@
 Chart.js graph rendering for price history.
 """
 
+import hashlib
 import json
-from .normalize import normalize_price
-from utils import format_french_date
+
+from utils import format_french_dates
+
+try:
+    import orjson
+except ImportError:  # optional faster encoder; json is used otherwise
+    orjson = None
 
 # Constants
 NO_CHANGE_LABEL = "No change"
@@ -14,6 +20,25 @@ PRICE_UP_LABEL = "Price up"
 DIV_CLOSE_TAG = "</div>"
 
 
+def stable_dom_id(prefix, name):
+    """DOM id derived from name; unlike hash() it is the same on every run."""
+    digest = hashlib.blake2b(str(name).encode("utf-8"), digest_size=8).hexdigest()
+    return f"{prefix}-{digest}"
+
+
+def to_script_json(obj):
+    """Serialize obj as compact JSON that is safe to inline in a <script> tag."""
+    text = None
+    if orjson is not None:
+        try:
+            text = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        except TypeError:
+            pass
+    if text is None:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return text.replace("</", "<\\/")
+
+
 def get_price_evolution_indicator(prices, color_scheme="slate"):
     """
     Returns (indicator_html, aria_label).
@@ -56,53 +81,24 @@ def get_price_evolution_indicator(prices, color_scheme="slate"):
         )
 
 
-def get_best_price_per_timestamp(product_history, ts_col, product_name):
-    """Returns a list of (timestamp, best_price) with missing timestamps filled by last known price."""
-    product_history = product_history.sort_values(by=ts_col)
-    timestamps = product_history[ts_col].tolist()
-    best_prices = []
-    last_price = None
-
-    for ts, group in product_history.groupby(ts_col):
-        norm_prices = [
-            float(normalize_price(p, product_name))
-            for p in group["Price"]
-            if p is not None and str(p).strip() != "" and str(p).lower() != "nan"
-        ]
-        valid_prices = [p for p in norm_prices if p > 0 and p < 5000]
-        if valid_prices:
-            min_price = min(valid_prices)
-            last_price = min_price
-        best_prices.append(last_price)
-
-    return timestamps, best_prices
-
-
-def render_price_history_graph_from_series(timestamps, prices, product_name):
-    """Render a price history graph from given timestamps and prices."""
-    indicator_html, _ = get_price_evolution_indicator(prices, "slate")
-
-    # Format timestamps to French date style
-    formatted_timestamps = [format_french_date(ts) for ts in timestamps]
-
-    data = {
-        "labels": formatted_timestamps,
-        "datasets": [
-            {
-                "label": f"Historique - {product_name}",
-                "data": prices,
-                "fill": False,
-                "borderColor": "#06b6d4",
-                "backgroundColor": "#0891b2",
-                "tension": 0.4,
-                "borderWidth": 2,
-            }
-        ],
-    }
-
-    chart_config = {
+def _product_chart_config(title, labels, prices):
+    """Chart.js config for a single product's best-price history."""
+    return {
         "type": "line",
-        "data": data,
+        "data": {
+            "labels": labels,
+            "datasets": [
+                {
+                    "label": title,
+                    "data": prices,
+                    "fill": False,
+                    "borderColor": "#06b6d4",
+                    "backgroundColor": "#0891b2",
+                    "tension": 0.4,
+                    "borderWidth": 2,
+                }
+            ],
+        },
         "options": {
             "responsive": True,
             "plugins": {
@@ -112,7 +108,7 @@ def render_price_history_graph_from_series(timestamps, prices, product_name):
                 },
                 "title": {
                     "display": True,
-                    "text": f"Historique - {product_name}",
+                    "text": title,
                     "color": "#06b6d4",
                     "font": {"size": 14, "weight": "bold"},
                 },
@@ -135,135 +131,70 @@ def render_price_history_graph_from_series(timestamps, prices, product_name):
         },
     }
 
-    chart_json = json.dumps(chart_config)
-    canvas_id = f"chart-{abs(hash(product_name))}"
+
+def render_price_history_graph_from_series(
+    timestamps, prices, product_name, charts=None
+):
+    """Render a price history graph from given timestamps and prices.
+
+    When a ``charts`` dict is given, the chart data is stored in it under the
+    canvas id and drawn later by render_product_charts_script, instead of
+    emitting one inline ``new Chart(...)`` per product.
+    """
+    indicator_html, _ = get_price_evolution_indicator(prices, "slate")
+
+    # Format timestamps to French date style
+    formatted_timestamps = format_french_dates(timestamps)
+
+    canvas_id = stable_dom_id("chart", product_name)
 
     html = f'<div class="flex items-center gap-2 mb-2"><span class="font-semibold text-slate-300">{product_name}</span>{indicator_html}</div>'
     html += '<div class="chart-bg p-4 rounded-xl">'
     html += f'<canvas id="{canvas_id}" class="w-full h-32" aria-label="Price history graph for {product_name}" role="img"></canvas>'
     html += DIV_CLOSE_TAG
-    html += f'<script>new Chart(document.getElementById("{canvas_id}"), {chart_json});</script>'
-
-    return html
 
+    if charts is not None:
+        charts[canvas_id] = {
+            "name": product_name,
+            "labels": formatted_timestamps,
+            "prices": prices,
+        }
+        return html
 
-def render_price_history_graph(history, product_name):
-    """Render a price history graph for a specific product from history data."""
-    ts_col = "Timestamp_ISO" if "Timestamp_ISO" in history.columns else "Date"
-    product_history = history[history["Product_Name"] == product_name]
-    timestamps, best_prices = get_best_price_per_timestamp(
-        product_history, ts_col, product_name
+    chart_json = to_script_json(
+        _product_chart_config(
+            f"Historique - {product_name}", formatted_timestamps, prices
+        )
     )
-
-    # Interpolate missing prices by repeating last known value
-    prices = [
-        p if p is not None else (prices[i - 1] if i > 0 else None)
-        for i, p in enumerate(best_prices)
-    ]
-
-    # Evolution indicator
-    indicator_html, _ = get_price_evolution_indicator(prices, "gray")
-
-    data = {
-        "labels": timestamps,
-        "datasets": [
-            {
-                "label": f"Price History for {product_name}",
-                "data": prices,
-                "fill": False,
-                "borderColor": "#0ea5e9",
-                "backgroundColor": "#bae6fd",
-                "tension": 0.3,
-            }
-        ],
-    }
-
-    chart_config = {
-        "type": "line",
-        "data": data,
-        "options": {
-            "responsive": True,
-            "plugins": {
-                "legend": {"display": True},
-                "title": {"display": True, "text": f"Price History for {product_name}"},
-            },
-            "scales": {"y": {"beginAtZero": True}},
-        },
-    }
-
-    chart_json = json.dumps(chart_config)
-    canvas_id = f"chart-{abs(hash(product_name))}"
-
-    html = f'<div class="flex items-center gap-2 mb-2"><span class="font-semibold">{product_name}</span>{indicator_html}</div>'
-    html += f'<canvas id="{canvas_id}" class="w-full h-32" aria-label="Price history graph for {product_name}" role="img"></canvas>'
     html += f'<script>new Chart(document.getElementById("{canvas_id}"), {chart_json});</script>'
 
     return html
 
 
-def render_all_price_graphs(product_prices, history):
-    """Render all price history graphs for multiple products."""
-    html = []
-    html.append('<div class="mt-12">')
-    html.append(
-        '<h2 class="text-2xl font-bold text-center text-cyan-700 mb-6">Best Price History Graphs</h2>'
+# Draws every collected product chart from one JSON payload
+PRODUCT_CHARTS_JS = """<script>
+(function () {
+    var payload = JSON.parse(document.getElementById("product-charts").textContent);
+    Object.keys(payload.charts).forEach(function (id) {
+        var canvas = document.getElementById(id);
+        if (!canvas) return;
+        var chart = payload.charts[id];
+        var config = JSON.parse(JSON.stringify(payload.template));
+        var title = "Historique - " + chart.name;
+        config.data.labels = chart.labels;
+        config.data.datasets[0].label = title;
+        config.data.datasets[0].data = chart.prices;
+        config.options.plugins.title.text = title;
+        new Chart(canvas, config);
+    });
+})();
+</script>"""
+
+
+def render_product_charts_script(charts):
+    """Emit the chart data collected by render_price_history_graph_from_series."""
+    payload = {"template": _product_chart_config("", [], []), "charts": charts}
+    return (
+        f'<script id="product-charts" type="application/json">{to_script_json(payload)}</script>\n'
+        + PRODUCT_CHARTS_JS
     )
-
-    for name, entries in product_prices.items():
-        product_history = history[history["Product_Name"] == name]
-        product_history = product_history.sort_values(
-            by="Timestamp_ISO" if "Timestamp_ISO" in product_history.columns else "Date"
-        )
-        ts_col = (
-            "Timestamp_ISO" if "Timestamp_ISO" in product_history.columns else "Date"
-        )
-        timestamps, best_prices = get_best_price_per_timestamp(
-            product_history, ts_col, name
-        )
-
-        prices = [
-            p if p is not None else (prices[i - 1] if i > 0 else None)
-            for i, p in enumerate(best_prices)
-        ]
-
-        indicator_html, _ = get_price_evolution_indicator(prices, "gray")
-
-        data = {
-            "labels": timestamps,
-            "datasets": [
-                {
-                    "label": f"Price History for {name}",
-                    "data": prices,
-                    "fill": False,
-                    "borderColor": "#0ea5e9",
-                    "backgroundColor": "#bae6fd",
-                    "tension": 0.3,
-                }
-            ],
-        }
-
-        chart_config = {
-            "type": "line",
-            "data": data,
-            "options": {
-                "responsive": True,
-                "plugins": {
-                    "legend": {"display": True},
-                    "title": {"display": True, "text": f"Price History for {name}"},
-                },
-                "scales": {"y": {"beginAtZero": True}},
-            },
-        }
-
-        chart_json = json.dumps(chart_config)
-        canvas_id = f"chart-{abs(hash(name))}"
-
-        html.append(
-            f'<div class="mb-10"><div class="flex items-center gap-2 mb-2"><h3 class="text-xl font-bold">{name}</h3>{indicator_html}</div><canvas id="{canvas_id}" class="w-full h-32" aria-label="Price history graph for {name}" role="img"></canvas>'
-        )
-        html.append(
-            f'<script>new Chart(document.getElementById("{canvas_id}"), {chart_json});</script></div>'
-        )
-
-    html.append(DIV_CLOSE_TAG)
-    return "\n".join(html)
@@ -2,56 +2,69 @@
 Price normalization and category/site helpers.
 """
 
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
 
-def normalize_price(price, name=None):
-    try:
-        p = float(price)
-    except Exception:
-        return price
-    if p > 2000:
-        if name:
-            name_l = name.lower()
-            if not any(
-                x in name_l
-                for x in [
-                    "gpu",
-                    "graphics",
-                    "carte graphique",
-                    "cpu",
-                    "ryzen",
-                    "processeur",
-                    "upgrade kit",
-                    "kit",
-                ]
-            ):
-                p = p / 100
-        else:
-            p = p / 100
-    return f"{p:.2f}"
+import numpy as np
+import pandas as pd
 
+# Products whose real price can exceed 2000, so large values are not cents
+PRICE_EXEMPT_KEYWORDS = [
+    "gpu",
+    "graphics",
+    "carte graphique",
+    "cpu",
+    "ryzen",
+    "processeur",
+    "upgrade kit",
+    "kit",
+]
+_PRICE_EXEMPT_PATTERN = "|".join(re.escape(x) for x in PRICE_EXEMPT_KEYWORDS)
 
-def get_category(name, url):
-    name_l = name.lower()
-    if any(
-        x in name_l for x in ["cooler", "spirit", "air", "ventirad", "thermalright"]
-    ):
-        return "Cooler"
-    if any(
-        x in name_l
-        for x in [
-            "cpu",
-            "ryzen",
-            "intel",
-            "amd processor",
-            "processeur",
-            "9800x3d",
-            "9800 x3d",
-        ]
-    ):
-        return "CPU"
-    if any(
-        x in name_l
-        for x in [
+
+def normalize_price_series(prices, names):
+    """Normalize aligned price and product name Series.
+
+    Prices above 2000 are taken as cents and divided by 100, unless the
+    product name contains one of PRICE_EXEMPT_KEYWORDS. Returns unrounded
+    floats; unparseable prices become NaN.
+    """
+    p = pd.to_numeric(prices, errors="coerce")
+    # Match the keywords once per distinct name, then broadcast by code
+    codes, uniques = pd.factorize(names)
+    exempt_names = np.asarray(
+        pd.Index(uniques)
+        .astype(str)
+        .str.lower()
+        .str.contains(_PRICE_EXEMPT_PATTERN, regex=True),
+        dtype=bool,
+    )
+    exempt = np.zeros(len(codes), dtype=bool)
+    known = codes >= 0
+    exempt[known] = exempt_names[codes[known]]
+    return p.where(~((p > 2000) & ~exempt), p / 100)
+
+
+def add_normalized_prices(history):
+    """Return history with a Price_norm column, computed once per DataFrame."""
+    if "Price_norm" in history.columns:
+        return history
+    return history.assign(
+        Price_norm=normalize_price_series(history["Price"], history["Product_Name"])
+    )
+
+
+# Category keyword rules, checked in order; the first matching rule wins
+CATEGORY_KEYWORDS = [
+    ("Cooler", ["cooler", "spirit", "air", "ventirad", "thermalright"]),
+    (
+        "CPU",
+        ["cpu", "ryzen", "intel", "amd processor", "processeur", "9800x3d", "9800 x3d"],
+    ),
+    (
+        "GPU",
+        [
             "radeon",
             "geforce",
             "rtx",
@@ -59,48 +72,55 @@ def get_category(name, url):
             "graphics",
             "carte graphique",
             "pulse radeon",
-        ]
-    ):
-        return "GPU"
-    if any(x in name_l for x in ["ram", "ddr", "memory", "mémoire"]):
-        return "RAM"
-    if any(x in name_l for x in ["ssd", "nvme", "m.2", "disque"]):
-        return "SSD"
-    if any(
-        x in name_l
-        for x in ["motherboard", "carte mère", "b850", "atx", "tuf gaming", "asus"]
-    ):
-        return "Motherboard"
-    if any(x in name_l for x in ["alimentation", "psu", "power supply", "a850gl"]):
-        return "PSU"
-    if any(x in name_l for x in ["keyboard", "clavier", "k70", "corsair"]):
-        return "Keyboard"
-    if any(x in name_l for x in ["mouse", "souris", "g502", "logitech"]):
-        return "Mouse"
-    if any(x in name_l for x in ["kit", "upgrade"]):
-        return "Upgrade Kit"
+        ],
+    ),
+    ("RAM", ["ram", "ddr", "memory", "mémoire"]),
+    ("SSD", ["ssd", "nvme", "m.2", "disque"]),
+    ("Motherboard", ["motherboard", "carte mère", "b850", "atx", "tuf gaming", "asus"]),
+    ("PSU", ["alimentation", "psu", "power supply", "a850gl"]),
+    ("Keyboard", ["keyboard", "clavier", "k70", "corsair"]),
+    ("Mouse", ["mouse", "souris", "g502", "logitech"]),
+    ("Upgrade Kit", ["kit", "upgrade"]),
+]
+# One precompiled alternation per category, matched against the lowercased name
+CATEGORY_PATTERNS = [
+    (cat, re.compile("|".join(re.escape(x) for x in keywords)))
+    for cat, keywords in CATEGORY_KEYWORDS
+]
+
+
+@lru_cache(maxsize=4096)
+def _category_for_name(name):
+    name_l = name.lower()
+    for cat, pattern in CATEGORY_PATTERNS:
+        if pattern.search(name_l):
+            return cat
     return "Other"
 
 
+def get_category(name, url):
+    # Only the name decides the category, so cache on it alone
+    return _category_for_name(name)
+
+
+# URL fragment -> site label, checked in order
+SITE_LABELS = {
+    "amazon.": "Amazon",
+    "ldlc.": "LDLC",
+    "idealo.": "Idealo",
+    "grosbill.": "Grosbill",
+    "materiel.net": "Materiel.net",
+    "topachat.": "TopAchat",
+    "alternate.": "Alternate",
+    "bpm-power.": "BPM Power",
+    "pccomponentes.": "PCComponentes",
+    "caseking.": "Caseking",
+}
+
+
+@lru_cache(maxsize=1024)
 def get_site_label(url):
-    if "amazon." in url:
-        return "Amazon"
-    if "ldlc." in url:
-        return "LDLC"
-    if "idealo." in url:
-        return "Idealo"
-    if "grosbill." in url:
-        return "Grosbill"
-    if "materiel.net" in url:
-        return "Materiel.net"
-    if "topachat." in url:
-        return "TopAchat"
-    if "alternate." in url:
-        return "Alternate"
-    if "bpm-power." in url:
-        return "BPM Power"
-    if "pccomponentes." in url:
-        return "PCComponentes"
-    if "caseking." in url:
-        return "Caseking"
-    return url.split("//")[-1].split("/")[0]
+    for token, label in SITE_LABELS.items():
+        if token in url:
+            return label
+    return urlsplit(url).netloc or url.split("/")[0]
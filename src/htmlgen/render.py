@@ -5,30 +5,44 @@ HTML rendering for summary table, product cards, and graphs.
 import sys
 import os
 import math
-import json
 import html
+import io
+from collections import defaultdict
+from itertools import repeat
 import pandas as pd
 import numpy as np
-from .normalize import normalize_price, get_category, get_site_label
+from .normalize import (
+    add_normalized_prices,
+    get_category,
+    get_site_label,
+)
+from .data import group_history_by_product, load_products, timestamp_column
 from .constants import EXCLUDED_CATEGORIES
-from .graph import render_price_history_graph, render_price_history_graph_from_series
+from .graph import (
+    render_price_history_graph_from_series,
+    render_product_charts_script,
+    stable_dom_id,
+    to_script_json,
+)
 from .price_utils import compute_summary_total
 from utils import format_french_date_full
 
 
-def price_to_float(x):
-    s = str(x).replace(",", ".").replace("€", "").strip().replace(" ", "")
-    if s in ["", "nan"]:
-        return np.nan
-    try:
-        return float(s)
-    except Exception:
-        return np.nan
+def price_series_to_float(prices: pd.Series) -> pd.Series:
+    """Parse scraped price text to floats for the whole Series; invalid prices become NaN."""
+    cleaned = (
+        prices.astype(str)
+        .str.replace(",", ".", regex=False)
+        .str.replace("€", "", regex=False)
+        .str.strip()
+        .str.replace(" ", "", regex=False)
+    )
+    return pd.to_numeric(cleaned, errors="coerce")
 
 
 # Add JS for switching components (vanilla JS, maximum compatibility)
 def render_component_switch_js():
-    excluded_js = json.dumps(sorted(EXCLUDED_CATEGORIES))
+    excluded_js = to_script_json(sorted(EXCLUDED_CATEGORIES))
     return f"""
 <script id="excluded-categories" type="application/json">{excluded_js}</script>
 <script>
@@ -110,32 +124,28 @@ def render_component_switch_js():
 """
 
 
-def _find_best_seen_date(
-    history: pd.DataFrame, name: str, url: str, price: float
-) -> str:
-    """Return formatted first-seen date matching the given product/url/price or '?' if none."""
-    history_entries = history[
-        (history["Product_Name"] == name) & (history["URL"] == url)
-    ]
-    if history_entries.empty:
-        return "?"
-    matched = history_entries.copy()
-    matched["Price_float"] = matched["Price"].apply(price_to_float)
-    matched = matched[np.isclose(matched["Price_float"], price, atol=0.01)]
-    if matched.empty:
+def _find_best_seen_date(product_history: pd.DataFrame, url: str, price: float) -> str:
+    """Return formatted first-seen date matching the given url/price in a product's history or '?' if none."""
+    # Positional numpy masks and a single take, no intermediate copies
+    rows = np.flatnonzero(
+        (product_history["URL"] == url).to_numpy(dtype=bool, na_value=False)
+    )
+    price_float = price_series_to_float(product_history["Price"].take(rows))
+    rows = rows[np.isclose(price_float.to_numpy(), price, atol=0.01)]
+    if not rows.size:
         return "?"
+    matched = product_history.take(rows)
     if "Timestamp_ISO" in matched.columns:
         valid_rows = matched[
             matched["Timestamp_ISO"].notnull() & (matched["Timestamp_ISO"] != "")
         ]
         if not valid_rows.empty:
-            best_row = valid_rows.sort_values(by="Timestamp_ISO").iloc[0]
-            return format_french_date_full(str(best_row["Timestamp_ISO"]))
+            # Only the earliest timestamp is needed, so no full sort
+            return format_french_date_full(valid_rows["Timestamp_ISO"].min())
     if "Date" in matched.columns:
         valid_rows = matched[matched["Date"].notnull() & (matched["Date"] != "")]
         if not valid_rows.empty:
-            best_row = valid_rows.sort_values(by="Date").iloc[0]
-            return format_french_date_full(str(best_row["Date"]))
+            return format_french_date_full(str(valid_rows["Date"].min()))
     return "?"
 
 
@@ -170,7 +180,8 @@ def _render_summary_row(
     cat: str,
     products: list,
     selected: dict,
-    history: pd.DataFrame,
+    history_by_product: dict,
+    empty_history: pd.DataFrame,
     td_category: str,
     td_product: str,
     td_price: str,
@@ -180,12 +191,16 @@ def _render_summary_row(
     name = selected["name"]
     price = float(selected["price"])
     url = selected["url"]
-    best_seen = _find_best_seen_date(history, name, url, price)
+    best_seen = _find_best_seen_date(
+        history_by_product.get(name, empty_history), url, price
+    )
     # Build enriched options with date and site for client-side switching
     enriched_products = []
     for p in products:
         p_best_seen = _find_best_seen_date(
-            history, p["name"], p["url"], float(p["price"])
+            history_by_product.get(p["name"], empty_history),
+            p["url"],
+            float(p["price"]),
         )
         enriched = dict(p)
         enriched["best_seen"] = p_best_seen
@@ -205,17 +220,31 @@ def _render_summary_row(
 
 
 def render_summary_table(
-    category_products, history, selected_products=None, debug_info=None
+    category_products,
+    history,
+    selected_products=None,
+    debug_info=None,
+    history_by_product=None,
+    out=None,
 ):
-    html = []
-    html.append(render_component_switch_js())
+    """Render the summary table of the selected product per category.
+
+    Returns the HTML, or writes it to the text stream ``out`` when one is
+    given (and returns None), like render_product_cards.
+    """
+    if history_by_product is None:
+        history_by_product = group_history_by_product(history)
+    empty_history = history.iloc[0:0]
+    buf = io.StringIO() if out is None else out
+    write = buf.write
+    write(render_component_switch_js())
     # We'll compute the total at the end using compute_summary_total
-    html.append('<div class="overflow-x-auto mb-10">')
-    html.append(
-        '<table id="summary-table" class="min-w-full glass-card rounded-xl shadow-2xl border border-slate-600 overflow-hidden">'
+    write('\n<div class="overflow-x-auto mb-10">')
+    write(
+        '\n<table id="summary-table" class="min-w-full glass-card rounded-xl shadow-2xl border border-slate-600 overflow-hidden">'
     )
-    html.append(
-        "<thead><tr>"
+    write(
+        "\n<thead><tr>"
         '<th class="px-6 py-4 text-left text-sm font-semibold text-slate-200 bg-slate-900/70">Catégorie</th>'
         '<th class="px-6 py-4 text-left text-sm font-semibold text-slate-200 bg-slate-900/70">Produit</th>'
         '<th class="px-6 py-4 text-left text-sm font-semibold text-slate-200 bg-slate-900/70">Meilleur Prix</th>'
@@ -237,12 +266,14 @@ def render_summary_table(
         selected = next(
             (p for p in products if p["name"] == selected_name), products[0]
         )
-        html.append(
+        write("\n")
+        write(
             _render_summary_row(
                 cat,
                 products,
                 selected,
-                history,
+                history_by_product,
+                empty_history,
                 TD_CATEGORY,
                 TD_PRODUCT,
                 TD_PRICE,
@@ -269,12 +300,13 @@ def render_summary_table(
                 dbg.get("source_url", "#"), dbg.get("source_url", "#")
             )
             debug_html += "</ul></div></td></tr>"
-            html.append(debug_html)
+            write("\n")
+            write(debug_html)
     total_price = compute_summary_total(category_products, selections)
     # Price TD for total includes a stable id for JS updates
     TD_PRICE_TOTAL = '<td id="total-price-value" class="border-t border-slate-700/50 px-6 py-4 font-bold text-green-400 text-lg">{:.2f}€</td>'
-    html.append(
-        "<tr id='total-row' class='bg-slate-900/80 font-bold border-t-2 border-cyan-500/30'>"
+    write(
+        "\n<tr id='total-row' class='bg-slate-900/80 font-bold border-t-2 border-cyan-500/30'>"
         + TD_CATEGORY.format("💰 Total")
         + TD_EMPTY
         + TD_PRICE_TOTAL.format(total_price)
@@ -282,11 +314,11 @@ def render_summary_table(
         + TD_EMPTY
         + "</tr>"
     )
-    html.append("</tbody></table></div>")
+    write("\n</tbody></table></div>")
     # Clarify that some categories are excluded from the total
     if EXCLUDED_CATEGORIES:
-        html.append(
-            '<div class="text-sm text-yellow-300/80 mt-2">\n'
+        write(
+            '\n<div class="text-sm text-yellow-300/80 mt-2">\n'
             + " ".join(
                 [
                     f"⚠️ {cat} non inclus dans le total (alternative aux composants)."
@@ -295,12 +327,14 @@ def render_summary_table(
             )
             + "</div>"
         )
-    return "\n".join(html)
+    if out is None:
+        return buf.getvalue()
 
 
 def _should_skip_timestamp(timestamp) -> bool:
     if (
         timestamp is None
+        or timestamp is pd.NaT
         or (isinstance(timestamp, float) and math.isnan(timestamp))
         or (
             isinstance(timestamp, str)
@@ -313,11 +347,11 @@ def _should_skip_timestamp(timestamp) -> bool:
 
 def _render_price_list(entries, name: str) -> str:
     items = []
+    # Entries come from normalize_and_filter_prices, already normalized
     for entry in entries:
-        norm_price = normalize_price(entry["price"], name)
         items.append(
             '<li class="price-item p-4 rounded-xl transition-all duration-300">'
-            f'<span class="font-bold text-green-400 text-lg">{norm_price}€</span> @ '
+            f'<span class="font-bold text-green-400 text-lg">{entry["price"]}€</span> @ '
             f'<a href="{entry["url"]}" target="_blank" class="text-cyan-400 hover:text-cyan-300 underline transition-colors ml-2">{get_site_label(entry["url"])}</a>'
             "</li>"
         )
@@ -325,32 +359,84 @@ def _render_price_list(entries, name: str) -> str:
 
 
 def _render_history_list(history_entries: pd.DataFrame, name: str) -> str:
+    history_entries = add_normalized_prices(history_entries)
+    ts_col = timestamp_column(history_entries)
+    timestamps = (
+        history_entries[ts_col].tolist()
+        if ts_col in history_entries.columns
+        else repeat("?")
+    )
     lis = []
-    for _, h in history_entries.iterrows():
-        timestamp = h["Timestamp_ISO"] if "Timestamp_ISO" in h else h.get("Date", "?")
+    for timestamp, price, norm, url in zip(
+        timestamps,
+        history_entries["Price"].to_numpy(),
+        history_entries["Price_norm"].to_numpy(),
+        history_entries["URL"].to_numpy(),
+    ):
         if _should_skip_timestamp(timestamp):
             continue
-        norm_price = normalize_price(h["Price"], name)
-        if norm_price is None or (
-            isinstance(norm_price, float) and math.isnan(norm_price)
-        ):
-            continue
-        ts_fmt = format_french_date_full(str(timestamp))
+        if not math.isnan(norm):
+            norm_price = f"{norm:.2f}"
+        else:
+            # Unparseable prices are shown as scraped
+            norm_price = price if isinstance(price, str) else "nan"
+        ts_fmt = format_french_date_full(timestamp)
         lis.append(
             f'<li class="history-item mb-2 p-3 rounded-xl transition-all duration-300">{ts_fmt}: '
             f'<span class="font-bold text-green-400">{norm_price}€</span> @ '
-            f'<a href="{h["URL"]}" target="_blank" class="text-cyan-400 hover:text-cyan-300 underline transition-colors ml-2">{get_site_label(h["URL"])}</a>'
+            f'<a href="{url}" target="_blank" class="text-cyan-400 hover:text-cyan-300 underline transition-colors ml-2">{get_site_label(url)}</a>'
             "</li>"
         )
     return '<ul class="text-sm text-slate-400 space-y-3">' + "".join(lis) + "</ul>"
 
 
-def render_product_cards(product_prices, history, product_min_prices):
-    from .data import load_products
-
-    DIV_END = "</div>"
-    html = []
-    html.append('<div class="grid gap-8">')
+# Stand-in for products that have no column in product_min_prices
+_NO_MIN_PRICES = pd.Series(dtype=float)
+
+# Static card fragments; each starts with the newline that separates it
+# from the previous fragment in the rendered page
+_UPGRADE_KIT_BANNER = (
+    "\n"
+    '<div class="bg-yellow-900/20 border border-yellow-500/30 rounded-lg p-4 mb-4">'
+    '<div class="flex items-center gap-2 text-yellow-400 font-semibold mb-2">'
+    "⚠️ Kit d'Upgrade - Alternative</div>"
+    '<div class="text-sm text-yellow-200/80">'
+    "Ce kit est une alternative à l'achat des composants individuels. "
+    "Il n'est pas inclus dans le calcul du prix total."
+    "</div></div>"
+)
+_HISTORY_BUTTON_TAIL = (
+    '\n<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>'
+    "\n</svg>"
+    "\n📊 Afficher l'historique des prix"
+    "\n</button>"
+)
+_NO_HISTORY_BUTTON = (
+    '\n<button disabled class="mb-4 px-6 py-3 bg-slate-800/70 text-slate-500 text-sm rounded-xl cursor-not-allowed flex items-center gap-3 opacity-60 border border-slate-700/50">'
+    '\n<svg class="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">'
+    '\n<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"></path>'
+    "\n</svg>"
+    "\n❌ Aucun historique disponible"
+    "\n</button>"
+)
+
+
+def render_product_cards(
+    product_prices, history, product_min_prices, history_by_product=None, out=None
+):
+    """Render the product card grid.
+
+    Returns the HTML, or writes it to the text stream ``out`` when one is
+    given (and returns None) so large pages need not be held in memory.
+    """
+    if history_by_product is None:
+        history_by_product = group_history_by_product(history)
+    empty_history = history.iloc[0:0]
+    DIV_END = "\n</div>"
+    buf = io.StringIO() if out is None else out
+    write = buf.write
+    write('<div class="grid gap-8">')
+    charts = {}
 
     # Load products data to get categories
     products_data = load_products("produits.csv")
@@ -360,87 +446,65 @@ def render_product_cards(product_prices, history, product_min_prices):
         product_data = products_data.get(name, {})
         category = product_data.get("category", "Other")
 
-        min_price_data = product_min_prices.get(name, {"timestamps": [], "prices": []})
+        if name in product_min_prices.columns:
+            min_prices = product_min_prices[name].dropna()
+        else:
+            min_prices = _NO_MIN_PRICES
         best = min(entries, key=lambda x: float(x["price"]))
-        history_id = f"history-{abs(hash(name))}"
-        html.append(
-            '<div class="glass-card rounded-2xl shadow-2xl border border-slate-600 p-8 hover:shadow-cyan-500/10 transition-all duration-300">'
+        history_id = stable_dom_id("history", name)
+        write(
+            '\n<div class="glass-card rounded-2xl shadow-2xl border border-slate-600 p-8 hover:shadow-cyan-500/10 transition-all duration-300">'
         )
 
         # Add special styling for Upgrade Kit items
         if category == "Upgrade Kit":
-            html.append(
-                '<div class="bg-yellow-900/20 border border-yellow-500/30 rounded-lg p-4 mb-4">'
-                '<div class="flex items-center gap-2 text-yellow-400 font-semibold mb-2">'
-                "⚠️ Kit d'Upgrade - Alternative</div>"
-                '<div class="text-sm text-yellow-200/80">'
-                "Ce kit est une alternative à l'achat des composants individuels. "
-                "Il n'est pas inclus dans le calcul du prix total."
-                "</div></div>"
-            )
+            write(_UPGRADE_KIT_BANNER)
 
-        html.append(
-            f'<h2 class="text-2xl font-bold text-cyan-400 mb-4 flex items-center gap-2">🔥 {name}</h2>'
-        )
-        html.append(
-            '<div class="mb-6">'
+        write(
+            f'\n<h2 class="text-2xl font-bold text-cyan-400 mb-4 flex items-center gap-2">🔥 {name}</h2>'
+            '\n<div class="mb-6">'
             f'<span class="inline-block price-badge text-white font-semibold px-6 py-3 rounded-xl shadow-lg">'
             f'💎 Meilleur prix: <span class="font-bold text-xl">{best["price"]}€</span> @ '
             f'<a href="{best["url"]}" target="_blank" class="underline hover:text-slate-200 transition-colors">{get_site_label(best["url"])}</a>'
-            "</span></div>"
+            "</span></div>\n"
         )
-        html.append(_render_price_list(entries, name))
-        html.append('<div class="mt-6">')
-        html.append(
+        write(_render_price_list(entries, name))
+        write('\n<div class="mt-6">\n')
+        write(
             render_price_history_graph_from_series(
-                min_price_data["timestamps"], min_price_data["prices"], name
+                min_prices.index.tolist(),
+                min_prices.tolist(),
+                name,
+                charts=charts,
             )
         )
-        html.append(DIV_END)
-        history_entries = history[history["Product_Name"] == name]
+        write(DIV_END)
+        history_entries = history_by_product.get(name, empty_history)
         if not history_entries.empty:
-            html.append(
-                f'<button onclick="toggleHistory(\'{history_id}\')" class="toggle-btn mb-4 px-6 py-3 text-white text-sm font-medium rounded-xl transition-all duration-300 flex items-center gap-3 shadow-lg hover:shadow-xl">'
-            )
-            html.append(
-                '<svg class="w-5 h-5 transition-transform duration-300" id="icon-'
-                + history_id
-                + '" fill="none" stroke="currentColor" viewBox="0 0 24 24">'
+            write(
+                f'\n<button onclick="toggleHistory(\'{history_id}\')" class="toggle-btn mb-4 px-6 py-3 text-white text-sm font-medium rounded-xl transition-all duration-300 flex items-center gap-3 shadow-lg hover:shadow-xl">'
+                f'\n<svg class="w-5 h-5 transition-transform duration-300" id="icon-{history_id}" fill="none" stroke="currentColor" viewBox="0 0 24 24">'
             )
-            html.append(
-                '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 9l-7 7-7-7"></path>'
+            write(_HISTORY_BUTTON_TAIL)
+            write(
+                f'\n<div id="{history_id}" class="historical-prices hidden">'
+                '\n<div class="font-semibold text-slate-300 mb-3 text-lg flex items-center gap-2">📈 Historique des prix :</div>\n'
             )
-            html.append("</svg>")
-            html.append("📊 Afficher l'historique des prix")
-            html.append("</button>")
-            html.append(f'<div id="{history_id}" class="historical-prices hidden">')
-            html.append(
-                '<div class="font-semibold text-slate-300 mb-3 text-lg flex items-center gap-2">📈 Historique des prix :</div>'
-            )
-            html.append(_render_history_list(history_entries, name))
-            html.append(DIV_END)
+            write(_render_history_list(history_entries, name))
+            write(DIV_END)
         else:
-            html.append(
-                '<button disabled class="mb-4 px-6 py-3 bg-slate-800/70 text-slate-500 text-sm rounded-xl cursor-not-allowed flex items-center gap-3 opacity-60 border border-slate-700/50">'
-            )
-            html.append(
-                '<svg class="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">'
-            )
-            html.append(
-                '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"></path>'
-            )
-            html.append("</svg>")
-            html.append("❌ Aucun historique disponible")
-            html.append("</button>")
-        html.append(DIV_END)
-    html.append(DIV_END)
-    return "\n".join(html)
+            write(_NO_HISTORY_BUTTON)
+        write(DIV_END)
+    write(DIV_END)
+    if charts:
+        write("\n")
+        write(render_product_charts_script(charts))
+    if out is None:
+        return buf.getvalue()
 
 
 def group_products_by_category(products):
     """Group a list of product dicts by their 'category' field."""
-    from collections import defaultdict
-
     grouped = defaultdict(list)
     for p in products:
         cat = p.get("category", "Other")
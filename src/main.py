@@ -285,10 +285,8 @@ def get_products_to_scrape(args, db_manager, db_config):
             return pd.read_csv(PRODUCTS_FILE)
         else:
             # Build products DataFrame from database
-            all_products = db_manager.get_products()
             products_data = []
-            for product in all_products:
-                urls = db_manager.get_product_urls(product.name)
+            for product, urls in db_manager.get_products_with_urls():
                 for url_entry in urls:
                     products_data.append(
                         {"Product_Name": product.name, "URL": url_entry.url}
@@ -298,14 +296,18 @@ def get_products_to_scrape(args, db_manager, db_config):
 
 def scrape_products(products, args, db_manager, db_config):
     """Scrape prices for the given products."""
-    now_iso = datetime.now().isoformat()
-    today = datetime.now().strftime("%Y-%m-%d")
+    now = datetime.now()
+    now_iso = now.isoformat()
+    today = now.strftime("%Y-%m-%d")
     updated_rows = []
     product_prices = {}
 
-    for _, row in products.iterrows():
+    # Plain dict rows: iterrows would build a Series per product
+    for row in products.to_dict("records"):
         # Check cache for SQLite backend
-        if db_config.database_type == "sqlite" and db_manager.is_url_cached(row["URL"]):
+        if db_config.database_type == "sqlite" and db_manager.is_url_cached(
+            row["URL"], now=now
+        ):
             logging.info(f"Skipping cached URL: {row['URL']}")
             continue
 
@@ -320,21 +322,27 @@ def save_scraping_results(updated_rows, db_manager, db_config):
     """Save scraping results to database."""
     if updated_rows:
         logging.info(f"Saving {len(updated_rows)} new price entries")
-        for row_data in updated_rows:
-            success = db_manager.add_price_entry(
-                row_data["Product_Name"],
-                row_data["URL"],
-                row_data["Price"],
-                datetime.fromisoformat(row_data["Timestamp_ISO"]),
-                vendor_name=row_data.get("Vendor_Name"),
-                vendor_url=row_data.get("Vendor_URL"),
-                is_marketplace=row_data.get("Is_Marketplace", False),
-                is_prime_eligible=row_data.get("Is_Prime_Eligible", False),
-            )
+        now = datetime.now()
+        entries = [
+            {
+                "product_name": row_data["Product_Name"],
+                "url": row_data["URL"],
+                "price": row_data["Price"],
+                "scraped_at": datetime.fromisoformat(row_data["Timestamp_ISO"]),
+                "vendor_name": row_data.get("Vendor_Name"),
+                "vendor_url": row_data.get("Vendor_URL"),
+                "is_marketplace": row_data.get("Is_Marketplace", False),
+                "is_prime_eligible": row_data.get("Is_Prime_Eligible", False),
+            }
+            for row_data in updated_rows
+        ]
+        with db_manager.fast_ingest():
+            successes = db_manager.add_price_entries(entries, now=now)
 
             # Update cache for SQLite
             if db_config.database_type == "sqlite":
-                db_manager.update_cache(row_data["URL"], success=success)
+                for row_data, success in zip(updated_rows, successes):
+                    db_manager.update_cache(row_data["URL"], success=success, now=now)
 
         # Export to CSV for GitHub Actions compatibility
         if db_config.database_type == "sqlite":
@@ -376,29 +384,31 @@ def main():
     # Setup database
     db_manager, db_config = setup_database_manager(args)
 
-    # Load products from CSV if available (for SQLite database only)
-    if db_config.database_type == "sqlite":
-        load_products_from_csv(db_manager, db_config)
+    # Closing flushes buffered product issues, even if the run fails
+    with db_manager:
+        # Load products from CSV if available (for SQLite database only)
+        if db_config.database_type == "sqlite":
+            load_products_from_csv(db_manager, db_config)
 
-    # Get products to scrape
-    products = get_products_to_scrape(args, db_manager, db_config)
-    if products is None:
-        return
+        # Get products to scrape
+        products = get_products_to_scrape(args, db_manager, db_config)
+        if products is None:
+            return
 
-    # Get price history for HTML generation
-    history = db_manager.get_price_history()
+        # Get price history for HTML generation
+        history = db_manager.get_price_history(parse_dates=True)
 
-    # Scrape products
-    product_prices, updated_rows = scrape_products(
-        products, args, db_manager, db_config
-    )
+        # Scrape products
+        product_prices, updated_rows = scrape_products(
+            products, args, db_manager, db_config
+        )
 
-    # Generate HTML report
-    if not args.no_html:
-        generate_html(product_prices, history)
+        # Generate HTML report
+        if not args.no_html:
+            generate_html(product_prices, history)
 
-    # Save results
-    save_scraping_results(updated_rows, db_manager, db_config)
+        # Save results
+        save_scraping_results(updated_rows, db_manager, db_config)
 
     logging.info("Scraping completed successfully")
 
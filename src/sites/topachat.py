@@ -4,6 +4,9 @@ import re
 import logging
 from utils import clean_price
 
+# Amount followed by a euro sign, e.g. "579,95 €"
+EURO_PRICE_PATTERN = re.compile(r"([\d.,]+)\s*€")
+
 
 def wait_for_topachat_price(page):
     """Wait for TopAchat price elements to load with multiple attempts."""
@@ -31,7 +34,7 @@ def extract_topachat_price(elem):
     """Extract price from TopAchat specific elements."""
     direct_texts = [t for t in elem.strings if t.strip()]
     main_text = direct_texts[0] if direct_texts else elem.get_text(strip=True)
-    match = re.search(r"([\d.,]+)\s*€", main_text)
+    match = EURO_PRICE_PATTERN.search(main_text)
     if match:
         price_str = match.group(1)
         price = clean_price(price_str)
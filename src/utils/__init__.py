@@ -2,12 +2,13 @@
 import logging
 import re
 import requests
+import pandas as pd
 from fake_useragent import UserAgent
-from datetime import datetime
+from datetime import date, datetime
 
 
 # French month abbreviations for date formatting
-MONTHS_FR = [
+MONTHS_FR = (
     "janv",
     "févr",
     "mars",
@@ -20,10 +21,10 @@ MONTHS_FR = [
     "oct",
     "nov",
     "déc",
-]
+)
 
 # French full month names for date formatting
-MONTHS_FR_FULL = [
+MONTHS_FR_FULL = (
     "janvier",
     "février",
     "mars",
@@ -36,30 +37,69 @@ MONTHS_FR_FULL = [
     "octobre",
     "novembre",
     "décembre",
-]
+)
+
+# Bare 3-6 digit price, e.g. "57995" left over from a flattened "579€95"
+FRENCH_CENTS_PATTERN = re.compile(r"^\d{3,6}$")
+
+
+def _parse_timestamp(dtstr):
+    """datetime for dtstr, or a date when dtstr has no time part.
+
+    Strings with a time try the C fromisoformat parser before strptime.
+    """
+    if isinstance(dtstr, date):
+        return dtstr
+    if "T" not in dtstr and ":" not in dtstr:
+        # Date-only values have no time to show; don't invent midnight
+        return datetime.strptime(dtstr.strip(), "%Y-%m-%d").date()
+    try:
+        return datetime.fromisoformat(dtstr)
+    except ValueError:
+        if "T" in dtstr:
+            return datetime.fromisoformat(dtstr.split(".")[0])
+        return datetime.strptime(dtstr, "%Y-%m-%d %H:%M:%S")
 
 
 def format_french_date(dtstr):
     """Format timestamp to French date style with abbreviated months."""
     try:
-        if "T" in dtstr:
-            dt = datetime.fromisoformat(dtstr.split(".")[0])
-        else:
-            dt = datetime.strptime(dtstr, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(dtstr)
         month = MONTHS_FR[dt.month - 1]
+        if not isinstance(dt, datetime):
+            return f"{dt.day:02d} {month} {dt.year}"
         return f"{dt.day:02d} {month} {dt.year} - {dt.hour:02d}:{dt.minute:02d}"
     except (ValueError, TypeError, IndexError):
         return dtstr
 
 
+def format_french_dates(values):
+    """format_french_date over a sequence; datetimes are formatted in one vectorized pass."""
+    values = list(values)
+    if values and pd.api.types.infer_dtype(values, skipna=False) in (
+        "datetime",
+        "datetime64",
+    ):
+        try:
+            idx = pd.DatetimeIndex(values)
+        except (ValueError, TypeError):  # e.g. mixed time zones
+            return [format_french_date(v) for v in values]
+        return [
+            f"{day} {MONTHS_FR[month - 1]} {rest}"
+            for day, month, rest in zip(
+                idx.strftime("%d"), idx.month, idx.strftime("%Y - %H:%M")
+            )
+        ]
+    return [format_french_date(v) for v in values]
+
+
 def format_french_date_full(dtstr):
     """Format timestamp to French date style with full month names."""
     try:
-        if "T" in dtstr:
-            dt = datetime.fromisoformat(dtstr.split(".")[0])
-        else:
-            dt = datetime.strptime(dtstr, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(dtstr)
         month = MONTHS_FR_FULL[dt.month - 1]
+        if not isinstance(dt, datetime):
+            return f"{dt.day} {month} {dt.year}"
         return f"{dt.day} {month} {dt.year}, {dt.hour:02d}:{dt.minute:02d}"
     except (ValueError, TypeError, IndexError):
         return dtstr
@@ -85,7 +125,7 @@ def clean_price(raw):
 
     # If it's a number with 3-6 digits ending in two digits that could be cents
     # Only apply this fix for reasonable price ranges (avoid breaking large legitimate prices)
-    if re.match(r"^\d{3,6}$", price) and len(price) >= 3 and len(price) <= 6:
+    if FRENCH_CENTS_PATTERN.match(price) and len(price) >= 3 and len(price) <= 6:
         # Check if this could be a French format by seeing if it contains the euro symbol in original
         if "€" in raw and "." not in raw and "," not in raw:
             # Insert decimal point before last 2 digits for French format
@@ -0,0 +1,185 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from database import DatabaseConfig, DatabaseManager
+
+PRODUCT = "Test CPU"
+URL = "https://www.amazon.fr/dp/TEST"
+
+
+def _make_manager(tmp_path, timestamp="2024-01-01T10:00:00Z"):
+    """SQLite manager seeded from CSV files, as on a first run."""
+    products_csv = tmp_path / "produits.csv"
+    products_csv.write_text(
+        f"Product_Name,URL,Category\n{PRODUCT},{URL},CPU\n", encoding="utf-8"
+    )
+    history_csv = tmp_path / "historique_prix.csv"
+    history_csv.write_text(
+        "Date,Product_Name,URL,Price,Timestamp_ISO\n"
+        f"2024-01-01,{PRODUCT},{URL},199.99,{timestamp}\n",
+        encoding="utf-8",
+    )
+    config = DatabaseConfig(
+        sqlite_path=str(tmp_path / "scraper.db"),
+        csv_products_path=str(products_csv),
+        csv_history_path=str(history_csv),
+    )
+    return DatabaseManager(config)
+
+
+def test_price_history_with_mixed_timezones(tmp_path):
+    manager = _make_manager(tmp_path)
+    # Migrated "Z" rows are tz-aware, fresh scrapes are naive
+    manager.add_price_entry(PRODUCT, URL, 189.99, scraped_at=datetime(2024, 1, 2, 9))
+
+    history = manager.get_price_history(parse_dates=True)
+    chunks = list(manager.get_price_history(parse_dates=True, chunksize=1))
+    manager.close()
+
+    assert history["Price"].tolist() == [199.99, 189.99]
+    # Mixed time zones stay text on every pandas version, one value per scrape
+    assert not pd.api.types.is_datetime64_any_dtype(history["Timestamp_ISO"])
+    assert history["Timestamp_ISO"].nunique() == 2
+    assert len(pd.concat(chunks)) == 2
+
+
+def test_price_history_parses_naive_timestamps(tmp_path):
+    manager = _make_manager(tmp_path, timestamp="2024-01-01T10:00:00")
+    manager.add_price_entry(PRODUCT, URL, 189.99, scraped_at=datetime(2024, 1, 2, 9))
+
+    history = manager.get_price_history(parse_dates=True)
+    manager.close()
+
+    assert pd.api.types.is_datetime64_any_dtype(history["Timestamp_ISO"])
+    assert history["Timestamp_ISO"].nunique() == 2
+
+
+def test_buffered_issues_flushed_when_run_fails(tmp_path):
+    manager = _make_manager(tmp_path)
+    product_id = manager.get_products()[0].id
+
+    with pytest.raises(RuntimeError):
+        with manager:
+            manager.log_product_issue(product_id, URL, "not_found")
+            raise RuntimeError("scrape failed")
+
+    # A separate manager only sees what was written to the database
+    reader = DatabaseManager(DatabaseConfig(sqlite_path=manager.config.sqlite_path))
+    issues = reader.get_product_issues()
+    reader.close()
+
+    assert [issue["url"] for issue in issues] == [URL]
+
+
+def test_abandoned_chunked_read_does_not_hide_new_rows(tmp_path):
+    manager = _make_manager(tmp_path)
+    manager.add_price_entry(PRODUCT, URL, 189.99, scraped_at=datetime(2024, 1, 2, 9))
+
+    chunks = manager.get_price_history(chunksize=1)
+    next(chunks)  # stop iterating early, keeping the iterator alive
+    manager.add_price_entry(PRODUCT, URL, 179.99, scraped_at=datetime(2024, 1, 3, 9))
+    history = manager.get_price_history()
+    manager.close()
+
+    assert history["Price"].tolist() == [199.99, 189.99, 179.99]
+
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+def _cache_row(manager):
+    with sqlite3.connect(manager.config.sqlite_path) as conn:
+        status, attempts, next_retry = conn.execute(
+            "SELECT status, attempts, next_retry FROM cache WHERE url = ?", (URL,)
+        ).fetchone()
+    return status, attempts, next_retry and datetime.fromisoformat(next_retry)
+
+
+def test_first_cache_miss_retries_after_one_hour(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    manager.update_cache(URL, success=False, now=NOW)
+
+    assert _cache_row(manager) == ("failed", 1, NOW + timedelta(hours=1))
+    assert manager.is_url_cached(URL, now=NOW + timedelta(minutes=59))
+    assert not manager.is_url_cached(URL, now=NOW + timedelta(minutes=61))
+    manager.close()
+
+
+def test_repeated_cache_misses_back_off_up_to_a_day(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    delays = []
+    for _ in range(7):
+        manager.update_cache(URL, success=False, now=NOW)
+        delays.append(_cache_row(manager)[2] - NOW)
+    manager.close()
+
+    assert delays == [timedelta(hours=h) for h in (1, 2, 4, 8, 16, 24, 24)]
+    assert _cache_row(manager)[1] == 7
+
+
+def test_cache_success_resets_the_backoff(tmp_path):
+    manager = _make_manager(tmp_path)
+    for _ in range(4):
+        manager.update_cache(URL, success=False, now=NOW)
+
+    manager.update_cache(URL, success=True, now=NOW)
+    assert _cache_row(manager) == ("success", 0, None)
+    assert manager.is_url_cached(URL, now=NOW + timedelta(hours=1))
+
+    manager.update_cache(URL, success=False, now=NOW)
+    assert _cache_row(manager) == ("failed", 1, NOW + timedelta(hours=1))
+    manager.close()
+
+
+def test_add_price_entries_flags_unknown_products(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    results = manager.add_price_entries(
+        [
+            {"product_name": PRODUCT, "url": URL, "price": 189.99},
+            {"product_name": "Unknown", "url": URL, "price": 1.0},
+            {
+                "product_name": PRODUCT,
+                "url": URL,
+                "price": 179.99,
+                "scraped_at": datetime(2024, 1, 3, 9),
+            },
+        ],
+        now=datetime(2024, 1, 2, 9),
+    )
+    history = manager.get_price_history(parse_dates=True)
+    manager.close()
+
+    assert results == [True, False, True]
+    assert history["Price"].tolist() == [199.99, 189.99, 179.99]
+    # Entries without scraped_at are stamped with now
+    assert history["Timestamp_ISO"].iloc[1:].astype(str).tolist() == [
+        "2024-01-02 09:00:00",
+        "2024-01-03 09:00:00",
+    ]
+
+
+def test_fast_ingest_commits_and_checkpoints(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    with manager.fast_ingest():
+        manager.add_price_entry(PRODUCT, URL, 189.99, scraped_at=NOW)
+        # Reads inside the block see the pending rows
+        assert len(manager.get_price_history()) == 2
+        with manager._get_connection() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+
+    # The WAL was checkpointed on exit: truncated, or removed with the last connection
+    wal_path = manager.config.sqlite_path + "-wal"
+    assert not os.path.exists(wal_path) or os.path.getsize(wal_path) == 0
+    manager.close()
+
+    reader = DatabaseManager(DatabaseConfig(sqlite_path=manager.config.sqlite_path))
+    assert reader.get_price_history()["Price"].tolist() == [199.99, 189.99]
+    reader.close()
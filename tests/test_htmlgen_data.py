@@ -0,0 +1,36 @@
+import pandas as pd
+
+from htmlgen.data import load_history
+
+HEADER = "Date,Product_Name,URL,Price,Timestamp_ISO\n"
+
+
+def _write_history(tmp_path, timestamps):
+    path = tmp_path / "historique_prix.csv"
+    rows = "".join(
+        f"2024-01-01,CPU,https://example.com/cpu,{100 + i},{ts}\n"
+        for i, ts in enumerate(timestamps)
+    )
+    path.write_text(HEADER + rows, encoding="utf-8")
+    return path
+
+
+def test_load_history_keeps_mixed_time_zones_as_text(tmp_path):
+    # Same instant written with and without an offset must not merge
+    path = _write_history(tmp_path, ["2024-01-01T10:00:00Z", "2024-01-01T10:00:00"])
+
+    history = load_history(path, parse_dates=True)
+
+    assert not pd.api.types.is_datetime64_any_dtype(history["Timestamp_ISO"])
+    assert history["Timestamp_ISO"].nunique() == 2
+
+
+def test_load_history_parses_consistent_timestamps(tmp_path):
+    path = _write_history(
+        tmp_path, ["2024-01-01T10:00:00", "2024-01-01 11:00:00.123456"]
+    )
+
+    history = load_history(path, parse_dates=True)
+
+    assert pd.api.types.is_datetime64_any_dtype(history["Timestamp_ISO"])
+    assert history["Timestamp_ISO"].nunique() == 2
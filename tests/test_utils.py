@@ -0,0 +1,11 @@
+from utils import format_french_date, format_french_date_full
+
+
+def test_date_only_values_have_no_time():
+    assert format_french_date_full("2025-07-07") == "7 juillet 2025"
+    assert format_french_date("2025-07-07") == "07 juil 2025"
+
+
+def test_timestamps_keep_their_time():
+    assert format_french_date_full("2025-07-07T10:05:00") == "7 juillet 2025, 10:05"
+    assert format_french_date("2025-07-07 10:05:00") == "07 juil 2025 - 10:05"